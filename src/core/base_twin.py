@@ -6,16 +6,23 @@ and Field Twin inherit from, ensuring consistent behavior and interfaces.
 """
 
 import json
+import logging
 import time
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
 from abc import abstractmethod
 
 from core.interfaces import TwinModel, TwinModelError
-from core.schemas import validate_json_schema
+from core.schemas import validate_json_schema, get_schema
 from utils.config import get_config
 
 
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between slow-update warnings from a single twin
+WARNING_INTERVAL_SECONDS = 1.0
+
+
 class BaseTwinModel(TwinModel):
     """
     Base implementation for digital twin models.
@@ -34,15 +41,23 @@ class BaseTwinModel(TwinModel):
         """
         self.twin_id = twin_id
         self.schema_name = schema_name
+        try:
+            self._schema: Optional[Dict[str, Any]] = get_schema(schema_name)
+        except KeyError:
+            self._schema = None
         self._state: Dict[str, Any] = {}
         self._last_update: Optional[datetime] = None
         self._update_count = 0
+        self._update_time_sum_ms = 0.0
+        self._update_time_count = 0
         self._performance_metrics = {
-            "total_updates": 0,
-            "avg_update_time_ms": 0.0,
             "last_update_time_ms": 0.0,
             "validation_failures": 0
         }
+        
+        # Load configuration
+        self._max_update_time_ms = get_config("performance.max_update_time_ms", 500)
+        self._last_warning_time = 0.0
     
     def update_state(self, telemetry_data: Dict[str, Any]) -> None:
         """
@@ -92,7 +107,7 @@ class BaseTwinModel(TwinModel):
             "twin_id": self.twin_id,
             "timestamp": self._last_update.isoformat() if self._last_update else None,
             "update_count": self._update_count,
-            "performance_metrics": self._performance_metrics.copy()
+            "performance_metrics": self.get_performance_metrics()
         }
         
         # Add twin-specific state (implemented by subclasses)
@@ -135,16 +150,22 @@ class BaseTwinModel(TwinModel):
         Returns:
             Performance metrics dictionary
         """
-        return self._performance_metrics.copy()
+        total_updates = self._update_time_count
+        return {
+            "total_updates": total_updates,
+            "avg_update_time_ms": (self._update_time_sum_ms / total_updates
+                                   if total_updates else 0.0),
+            **self._performance_metrics
+        }
     
     def reset_state(self) -> None:
         """Reset twin model to initial state."""
         self._state = {}
         self._last_update = None
         self._update_count = 0
+        self._update_time_sum_ms = 0.0
+        self._update_time_count = 0
         self._performance_metrics = {
-            "total_updates": 0,
-            "avg_update_time_ms": 0.0,
             "last_update_time_ms": 0.0,
             "validation_failures": 0
         }
@@ -218,10 +239,11 @@ class BaseTwinModel(TwinModel):
         Returns:
             True if state is valid, False otherwise
         """
+        if self._schema is None:
+            return True
+        
         try:
-            from schemas import get_schema
-            schema = get_schema(self.schema_name)
-            return validate_json_schema(state, schema)
+            return validate_json_schema(state, self._schema)
         except Exception:
             # If schema validation fails, allow the state but log the issue
             return True
@@ -245,19 +267,19 @@ class BaseTwinModel(TwinModel):
         Args:
             update_time_ms: Time taken for this update in milliseconds
         """
-        self._performance_metrics["total_updates"] += 1
         self._performance_metrics["last_update_time_ms"] = update_time_ms
         
-        # Calculate running average
-        total_updates = self._performance_metrics["total_updates"]
-        current_avg = self._performance_metrics["avg_update_time_ms"]
-        new_avg = ((current_avg * (total_updates - 1)) + update_time_ms) / total_updates
-        self._performance_metrics["avg_update_time_ms"] = new_avg
+        # Accumulate sum and count; the average is derived on read
+        self._update_time_sum_ms += update_time_ms
+        self._update_time_count += 1
         
         # Check performance thresholds
-        max_update_time = get_config("performance.max_update_time_ms", 500)
-        if update_time_ms > max_update_time:
-            print(f"Warning: {self.twin_id} update took {update_time_ms:.2f}ms (threshold: {max_update_time}ms)")
+        if update_time_ms > self._max_update_time_ms:
+            now = time.monotonic()
+            if now - self._last_warning_time > WARNING_INTERVAL_SECONDS:
+                self._last_warning_time = now
+                logger.warning("%s update took %.2fms (threshold: %sms)",
+                               self.twin_id, update_time_ms, self._max_update_time_ms)
     
     def __str__(self) -> str:
         """String representation of the twin model."""
@@ -7,8 +7,11 @@ intelligent strategy recommendations for race engineers.
 
 import json
 import asyncio
+import hashlib
+import time
 import aiohttp
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from typing import Dict, List, Any, AsyncIterator, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 
@@ -31,11 +34,18 @@ class StrategyRecommendation:
 class AIStrategist:
     """AI strategist that generates recommendations using MAX LLM"""
     
-    def __init__(self, max_endpoint: str = "http://localhost:8000/v1"):
+    def __init__(self, max_endpoint: str = "http://localhost:8000/v1",
+                 cache_size: int = 128, cache_ttl_seconds: float = 30.0):
         self.max_endpoint = max_endpoint
         self.model_name = "llama-3.1-8b"  # Default model
         self.session: Optional[aiohttp.ClientSession] = None
         
+        # Parsed MAX responses keyed by prompt digest, least recently used
+        # first; entries are (expiry on the monotonic clock, recommendations)
+        self.cache_size = cache_size
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._response_cache: "OrderedDict[str, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        
         # Strategy templates for different scenarios
         self.strategy_templates = {
             "urgent": {
@@ -69,7 +79,12 @@ class AIStrategist:
             await self.session.close()
     
     async def generate_recommendations(self, strategy_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Generate strategy recommendations based on simulation data"""
+        """
+        Generate strategy recommendations based on simulation data.
+        
+        Recommendations from MAX are reused for repeated race states within
+        the cache TTL, so callers must treat them as read-only.
+        """
         try:
             # Extract key information
             car_twin = strategy_data.get("car_twin")
@@ -94,9 +109,54 @@ class AIStrategist:
             print(f"Error generating recommendations: {e}")
             return self._generate_emergency_recommendations()
     
+    async def stream_recommendations(self, strategy_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield strategy recommendations as MAX generates them.
+        
+        Each recommendation is yielded as soon as its numbered block in the
+        response is complete, so partial strategies can be shown before
+        generation ends. Falls back like generate_recommendations when MAX
+        produces nothing.
+        """
+        try:
+            # Extract key information
+            car_twin = strategy_data.get("car_twin")
+            field_twin = strategy_data.get("field_twin")
+            simulation_results = strategy_data.get("simulation_results", [])
+            race_context = strategy_data.get("race_context", {})
+            
+            produced = False
+            async for recommendation in self._stream_with_max(
+                car_twin, field_twin, simulation_results, race_context
+            ):
+                produced = True
+                yield recommendation
+            
+            # Fallback to rule-based recommendations if MAX fails
+            if not produced:
+                for recommendation in self._generate_rule_based_recommendations(
+                    car_twin, field_twin, simulation_results, race_context
+                ):
+                    yield recommendation
+            
+        except Exception as e:
+            print(f"Error generating recommendations: {e}")
+            for recommendation in self._generate_emergency_recommendations():
+                yield recommendation
+    
     async def _generate_with_max(self, car_twin, field_twin, simulation_results, 
                                 race_context) -> List[Dict[str, Any]]:
         """Generate recommendations using MAX LLM"""
+        return [
+            recommendation async for recommendation in self._stream_with_max(
+                car_twin, field_twin, simulation_results, race_context
+            )
+        ]
+    
+    async def _stream_with_max(self, car_twin, field_twin, simulation_results,
+                               race_context) -> AsyncIterator[Dict[str, Any]]:
+        """Stream recommendations from a MAX chat completion as each one completes"""
+        produced = 0
         try:
             if not self.session:
                 self.session = aiohttp.ClientSession()
@@ -104,6 +164,15 @@ class AIStrategist:
             # Prepare prompt for MAX
             prompt = self._build_strategy_prompt(car_twin, field_twin, simulation_results, race_context)
             
+            # The prompt holds everything MAX sees, so an identical prompt
+            # gets the same recommendations without a round trip
+            cache_key = hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                for recommendation in cached:
+                    yield recommendation
+                return
+            
             # Call MAX API
             payload = {
                 "model": "modularai/Llama-3.1-8B-Instruct-GGUF",
@@ -118,26 +187,87 @@ class AIStrategist:
                     }
                 ],
                 "max_tokens": 500,
-                "temperature": 0.7
+                "temperature": 0.7,
+                "stream": True
             }
             
             async with self.session.post(
                 f"{self.max_endpoint}/chat/completions",
                 json=payload,
-                headers={"Content-Type": "application/json"}
+                headers={"Content-Type": "application/json", "Accept": "text/event-stream"}
             ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    content = result["choices"][0]["message"]["content"]
-                    return self._parse_llm_response(content, car_twin, simulation_results)
-                else:
+                if response.status != 200:
                     print(f"MAX API error: {response.status}")
-                    return []
+                    return
+                
+                recommendations = []
+                current_rec: Dict[str, str] = {}
+                pending = ""
+                
+                # Server-sent events, one "data: {...}" chunk per line
+                async for raw_line in response.content:
+                    event = raw_line.decode("utf-8").strip()
+                    if not event.startswith("data:"):
+                        continue
+                    data = event[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    
+                    delta = json.loads(data)["choices"][0].get("delta", {})
+                    pending += delta.get("content") or ""
+                    
+                    # Parse each completed line of generated text
+                    while "\n" in pending:
+                        line, pending = pending.split("\n", 1)
+                        finished, current_rec = self._parse_response_line(line, current_rec)
+                        if finished:
+                            recommendation = self._structure_recommendation(finished, produced)
+                            recommendations.append(recommendation)
+                            produced += 1
+                            yield recommendation
+                
+                # The final line has no newline; it may still start a new
+                # recommendation and so finish the previous one
+                finished, current_rec = self._parse_response_line(pending, current_rec)
+                for rec in (finished, current_rec):
+                    if rec:
+                        recommendation = self._structure_recommendation(rec, produced)
+                        recommendations.append(recommendation)
+                        produced += 1
+                        yield recommendation
+                
+                if recommendations:
+                    self._cache_response(cache_key, recommendations)
                     
         except Exception as e:
             print(f"Error calling MAX API: {e}")
-            # Fallback to rule-based recommendations
-            return self._generate_rule_based_recommendations(car_twin, field_twin, simulation_results, race_context)
+            # Fallback to rule-based recommendations unless MAX already produced some
+            if not produced:
+                for recommendation in self._generate_rule_based_recommendations(
+                    car_twin, field_twin, simulation_results, race_context
+                ):
+                    yield recommendation
+    
+    def _get_cached_response(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
+        """Get unexpired cached recommendations for a prompt digest"""
+        entry = self._response_cache.get(cache_key)
+        if entry is None:
+            return None
+        
+        expires_at, recommendations = entry
+        if expires_at <= time.monotonic():
+            del self._response_cache[cache_key]
+            return None
+        
+        self._response_cache.move_to_end(cache_key)
+        return recommendations
+    
+    def _cache_response(self, cache_key: str, recommendations: List[Dict[str, Any]]) -> None:
+        """Cache parsed recommendations, evicting the least recently used entry"""
+        self._response_cache[cache_key] = (time.monotonic() + self.cache_ttl_seconds, recommendations)
+        self._response_cache.move_to_end(cache_key)
+        if len(self._response_cache) > self.cache_size:
+            self._response_cache.popitem(last=False)
     
     def _build_strategy_prompt(self, car_twin, field_twin, simulation_results, race_context) -> str:
         """Build prompt for MAX LLM"""
@@ -181,61 +311,49 @@ Focus on immediate tactical decisions that the race engineer can communicate to
         
         return prompt
     
-    def _parse_llm_response(self, content: str, car_twin, simulation_results) -> List[Dict[str, Any]]:
-        """Parse LLM response into structured recommendations"""
-        recommendations = []
+    def _parse_response_line(self, line: str,
+                             current_rec: Dict[str, str]) -> Tuple[Optional[Dict[str, str]], Dict[str, str]]:
+        """
+        Apply one line of LLM output to the recommendation being parsed.
         
-        try:
-            # Simple parsing - in production, use more robust parsing
-            lines = content.split('\n')
-            current_rec = {}
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                if line.startswith(('1.', '2.', '3.')):
-                    if current_rec:
-                        recommendations.append(current_rec)
-                    current_rec = {"raw_text": line}
-                elif line.startswith('Description:'):
-                    current_rec['description'] = line.replace('Description:', '').strip()
-                elif line.startswith('Expected Benefit:'):
-                    current_rec['expected_benefit'] = line.replace('Expected Benefit:', '').strip()
-                elif line.startswith('Execution:'):
-                    current_rec['execution'] = line.replace('Execution:', '').strip()
-                elif line.startswith('Reasoning:'):
-                    current_rec['reasoning'] = line.replace('Reasoning:', '').strip()
-                elif line.startswith('Risks:'):
-                    current_rec['risks'] = line.replace('Risks:', '').strip()
-                elif line.startswith('Alternatives:'):
-                    current_rec['alternatives'] = line.replace('Alternatives:', '').strip()
-            
-            if current_rec:
-                recommendations.append(current_rec)
-            
-            # Convert to structured format
-            structured_recs = []
-            for i, rec in enumerate(recommendations):
-                structured_recs.append({
-                    "priority": self._extract_priority(rec.get('raw_text', '')),
-                    "category": self._extract_category(rec.get('raw_text', '')),
-                    "title": rec.get('raw_text', f'Strategy {i+1}'),
-                    "description": rec.get('description', ''),
-                    "confidence": 0.8,  # Default confidence
-                    "expected_benefit": rec.get('expected_benefit', ''),
-                    "execution_lap": self._extract_execution_lap(rec.get('execution', '')),
-                    "reasoning": rec.get('reasoning', ''),
-                    "risks": [rec.get('risks', '')],
-                    "alternatives": [rec.get('alternatives', '')]
-                })
-            
-            return structured_recs
-            
-        except Exception as e:
-            print(f"Error parsing LLM response: {e}")
-            return []
+        Returns the previous recommendation when the line starts a new
+        numbered one, along with the recommendation now being parsed.
+        """
+        line = line.strip()
+        if not line:
+            return None, current_rec
+        
+        if line.startswith(('1.', '2.', '3.')):
+            return (current_rec or None), {"raw_text": line}
+        elif line.startswith('Description:'):
+            current_rec['description'] = line.replace('Description:', '').strip()
+        elif line.startswith('Expected Benefit:'):
+            current_rec['expected_benefit'] = line.replace('Expected Benefit:', '').strip()
+        elif line.startswith('Execution:'):
+            current_rec['execution'] = line.replace('Execution:', '').strip()
+        elif line.startswith('Reasoning:'):
+            current_rec['reasoning'] = line.replace('Reasoning:', '').strip()
+        elif line.startswith('Risks:'):
+            current_rec['risks'] = line.replace('Risks:', '').strip()
+        elif line.startswith('Alternatives:'):
+            current_rec['alternatives'] = line.replace('Alternatives:', '').strip()
+        
+        return None, current_rec
+    
+    def _structure_recommendation(self, rec: Dict[str, str], index: int) -> Dict[str, Any]:
+        """Convert a parsed recommendation block into the structured format"""
+        return {
+            "priority": self._extract_priority(rec.get('raw_text', '')),
+            "category": self._extract_category(rec.get('raw_text', '')),
+            "title": rec.get('raw_text', f'Strategy {index+1}'),
+            "description": rec.get('description', ''),
+            "confidence": 0.8,  # Default confidence
+            "expected_benefit": rec.get('expected_benefit', ''),
+            "execution_lap": self._extract_execution_lap(rec.get('execution', '')),
+            "reasoning": rec.get('reasoning', ''),
+            "risks": [rec.get('risks', '')],
+            "alternatives": [rec.get('alternatives', '')]
+        }
     
     def _extract_priority(self, text: str) -> str:
         """Extract priority from text"""
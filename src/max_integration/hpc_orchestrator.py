@@ -5,15 +5,73 @@ This module orchestrates the Field Twin component and manages integration
 with external HPC simulation systems for strategic analysis.
 """
 
-import json
+import asyncio
+import hashlib
+import mmap
+import os
+import queue
+import threading
 import time
+from collections import Counter, deque
+from concurrent.futures import Future, wait
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List
+from itertools import takewhile
+from typing import Dict, Any, Optional, List, Callable, Set
 from pathlib import Path
 
-from twin_system.field_twin import FieldTwin
+import numpy as np
+
+from twin_system.field_twin import FieldTwin, Threat, THREAT_NAMES
 from core.interfaces import TwinModelError
 from utils.config import get_config
+from utils.jit import njit, NUMBA_AVAILABLE
+from utils.json_codec import json_dumpb, json_loads
+
+
+# Competitive pressure contributed by a competitor, indexed by threat code
+_THREAT_PRESSURE_SCORES = np.array([0.1, 0.3, 0.6, 1.0])
+
+# Competitor table column holding each behavioral trait, in profile order
+_TRAIT_COLUMNS = (
+    ("undercut_tendency", "undercut_tend"),
+    ("aggressive_defense", "aggr_def"),
+    ("tire_management", "tire_mgmt"),
+)
+
+# Field Twin state sections compared, with the competitors, to decide whether
+# a snapshot changed; the rest is update bookkeeping
+_PERSISTED_CONTENT_KEYS = ("strategic_opportunities", "race_context", "recent_events")
+
+# Recent position updates per competitor considered for position volatility
+VOLATILITY_WINDOW = 5
+
+
+@njit(cache=True)
+def _count_position_changes(positions: np.ndarray, lengths: np.ndarray) -> int:
+    """
+    Count changes between consecutive positions across competitors.
+    
+    Args:
+        positions: (competitors, window) recent positions, oldest first
+        lengths: Number of valid positions in each row
+        
+    Returns:
+        Total number of position changes
+    """
+    changes = 0
+    for i in range(positions.shape[0]):
+        for j in range(1, lengths[i]):
+            if positions[i, j] != positions[i, j - 1]:
+                changes += 1
+    return changes
+
+
+def _warm_up_kernels() -> None:
+    """Compile the JIT kernels, or load them from the cache, ahead of the first analysis."""
+    if NUMBA_AVAILABLE:
+        _count_position_changes(
+            np.zeros((1, VOLATILITY_WINDOW), dtype=np.int16), np.zeros(1, dtype=np.int64)
+        )
 
 
 class HPCOrchestrator:
@@ -32,6 +90,7 @@ class HPCOrchestrator:
             config_path: Optional path to configuration file
         """
         self.field_twin = FieldTwin()
+        _warm_up_kernels()
         self.config_path = config_path
         
         # Simulation integration settings
@@ -39,6 +98,33 @@ class HPCOrchestrator:
         self.simulation_endpoint = get_config("hpc.simulation_endpoint", "http://localhost:8080")
         self.max_concurrent_simulations = get_config("hpc.max_concurrent", 3)
         
+        # Analysis thresholds, resolved once; cached analyses depend on them,
+        # so they are fixed for the lifetime of the orchestrator
+        self.opportunity_probability_threshold = get_config(
+            "hpc.opportunity_probability_threshold", 0.6
+        )
+        self.simulation_opportunity_threshold = get_config(
+            "hpc.simulation_opportunity_threshold", 0.8
+        )
+        self.simulation_critical_threats = get_config("hpc.simulation_critical_threats", 2)
+        self.undercut_risk_tendency = get_config("hpc.undercut_risk_tendency", 0.7)
+        self.close_gap_seconds = get_config("hpc.close_gap_seconds", 10.0)
+        self.recent_pit_window_seconds = get_config("hpc.recent_pit_window_seconds", 300.0)
+        
+        # Simulation requests run on a background event loop, started on first use
+        self._sim_lock = threading.Lock()
+        self._sim_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sim_thread: Optional[threading.Thread] = None
+        self._sim_semaphore: Optional[asyncio.Semaphore] = None
+        self._sim_futures: Set[Future] = set()
+        # Simulation fired by _check_simulation_triggers, per scenario; a
+        # trigger is skipped while the previous one for its scenario is pending
+        self._triggered_simulations: Dict[str, Future] = {}
+        
+        # Telemetry frames waiting for update_field_twin_batched
+        self._tick_queue: deque = deque()
+        self.batch_size = get_config("hpc.batch_size", 8)
+        
         # Performance tracking
         self.update_count = 0
         self.last_update_time = None
@@ -48,10 +134,34 @@ class HPCOrchestrator:
             "simulation_requests": 0,
             "simulation_successes": 0
         }
+        # Read-only copy of the metrics shared by analyses and snapshots,
+        # rebuilt after the metrics change. Simulations update the metrics
+        # from the simulation loop thread, so access goes through the lock.
+        self._metrics_snapshot: Optional[Dict[str, Any]] = None
+        self._metrics_lock = threading.Lock()
+        
+        # Reusable buffers for the position volatility scan
+        self._volatility_positions = np.zeros((0, VOLATILITY_WINDOW), dtype=np.int16)
+        self._volatility_lengths = np.zeros(0, dtype=np.int64)
         
-        # State persistence
+        # Analyses derived from the field state, reused until its version changes
+        self._analysis_cache: Dict[str, Any] = {}
+        self._analysis_version = -1
+        
+        # State persistence, written by a background thread; only the latest
+        # snapshot is kept when writes fall behind updates. Between full
+        # snapshots, updates are appended to a journal holding only the
+        # competitors that changed.
         self.state_file = Path("shared/field_twin_state.json")
         self.state_file.parent.mkdir(exist_ok=True)
+        self.journal_file = self.state_file.with_suffix(".journal")
+        self.state_snapshot_interval = get_config("hpc.state_snapshot_interval", 50)
+        self._persist_queue: queue.Queue = queue.Queue(maxsize=1)
+        self._persistence_thread: Optional[threading.Thread] = None
+        self._journal_fd: Optional[int] = None
+        self._journal_length = 0
+        self._written_competitors: Optional[Dict[str, bytes]] = None
+        self._written_digest: Optional[bytes] = None
         
         # Load previous state if available
         self._load_previous_state()
@@ -88,6 +198,56 @@ class HPCOrchestrator:
         except Exception as e:
             raise TwinModelError(f"Failed to update Field Twin: {str(e)}")
     
+    def enqueue_telemetry(self, telemetry_data: Dict[str, Any]) -> None:
+        """
+        Queue telemetry data for the next batched update.
+        
+        Args:
+            telemetry_data: Normalized telemetry data
+        """
+        self._tick_queue.append(telemetry_data)
+    
+    def update_field_twin_batched(self) -> int:
+        """
+        Update Field Twin with up to batch_size queued telemetry frames.
+        
+        Every frame updates the Field Twin, but state persistence and
+        simulation trigger checks run once for the whole batch. Callers that
+        need those after every frame should use update_field_twin instead.
+        
+        Returns:
+            Number of frames applied
+            
+        Raises:
+            TwinModelError: If update fails
+        """
+        frames = 0
+        
+        try:
+            while frames < self.batch_size and self._tick_queue:
+                telemetry_data = self._tick_queue.popleft()
+                start_time = time.time()
+                
+                # Update Field Twin state
+                self.field_twin.update_state(telemetry_data)
+                
+                # Update performance metrics
+                update_time_ms = (time.time() - start_time) * 1000
+                self._update_performance_metrics(update_time_ms)
+                frames += 1
+            
+            if frames:
+                self._persist_state()
+                self._check_simulation_triggers()
+                
+                self.update_count += frames
+                self.last_update_time = datetime.now(timezone.utc)
+            
+        except Exception as e:
+            raise TwinModelError(f"Failed to update Field Twin: {str(e)}")
+        
+        return frames
+    
     def get_field_twin_state(self) -> Dict[str, Any]:
         """
         Get current Field Twin state.
@@ -101,19 +261,26 @@ class HPCOrchestrator:
         """
         Get comprehensive strategic analysis.
         
+        The competitor summary, threat assessment and performance metrics are
+        shared with later calls until the underlying state changes, so
+        callers must treat them as read-only.
+        
         Returns:
             Strategic analysis including opportunities, threats, and recommendations
         """
         field_state = self.field_twin.get_current_state()
+        threats = self._cached_analysis("threat_assessment", self._assess_threats)
         
         analysis = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
-            "competitor_summary": self._generate_competitor_summary(),
+            "competitor_summary": self._cached_analysis(
+                "competitor_summary", self._generate_competitor_summary
+            ),
             "strategic_opportunities": field_state.get("strategic_opportunities", []),
-            "threat_assessment": self._assess_threats(),
-            "strategic_recommendations": self._generate_recommendations(),
-            "race_situation": self._analyze_race_situation(),
-            "performance_metrics": self.performance_metrics.copy()
+            "threat_assessment": threats,
+            "strategic_recommendations": self._generate_recommendations(field_state, threats),
+            "race_situation": self._analyze_race_situation(field_state),
+            "performance_metrics": self._get_metrics_snapshot()
         }
         
         return analysis
@@ -143,14 +310,14 @@ class HPCOrchestrator:
             "strategic_context": {
                 "current_threat_level": competitor.strategic_threat_level,
                 "pit_probability": competitor.pit_probability,
-                "behavioral_profile": competitor.behavioral_profile
+                "behavioral_profile": competitor.behavioral_profile.to_dict()
             },
             "confidence_factors": self._calculate_prediction_confidence(competitor)
         }
     
     def trigger_strategic_simulation(self, scenario: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Trigger HPC strategic simulation.
+        Trigger HPC strategic simulation and wait for its results.
         
         Args:
             scenario: Simulation scenario type
@@ -159,8 +326,26 @@ class HPCOrchestrator:
         Returns:
             Simulation results or status
         """
+        return self.submit_strategic_simulation(scenario, parameters).result()
+    
+    def submit_strategic_simulation(self, scenario: str, parameters: Dict[str, Any]) -> Future:
+        """
+        Submit HPC strategic simulation without waiting for it.
+        
+        At most max_concurrent_simulations requests are in flight at once;
+        later submissions wait for a free slot on the simulation loop.
+        
+        Args:
+            scenario: Simulation scenario type
+            parameters: Simulation parameters
+            
+        Returns:
+            Future resolving to the simulation results or status
+        """
         if not self.hpc_enabled:
-            return {"status": "disabled", "message": "HPC simulation not enabled"}
+            future = Future()
+            future.set_result({"status": "disabled", "message": "HPC simulation not enabled"})
+            return future
         
         simulation_request = {
             "scenario": scenario,
@@ -170,65 +355,124 @@ class HPCOrchestrator:
             "request_id": f"sim_{int(time.time())}"
         }
         
-        try:
-            # In a real implementation, this would make HTTP requests to HPC system
-            result = self._mock_simulation_request(simulation_request)
-            
-            self.performance_metrics["simulation_requests"] += 1
-            if result.get("status") == "success":
-                self.performance_metrics["simulation_successes"] += 1
+        with self._sim_lock:
+            if self._sim_loop is None:
+                self._start_simulation_loop()
+            future = asyncio.run_coroutine_threadsafe(
+                self._run_simulation(simulation_request), self._sim_loop
+            )
+            self._sim_futures.add(future)
+        future.add_done_callback(self._forget_simulation)
+        return future
+    
+    def _forget_simulation(self, future: Future) -> None:
+        """
+        Drop a finished simulation from the pending set.
+        
+        Args:
+            future: Finished simulation future
+        """
+        with self._sim_lock:
+            self._sim_futures.discard(future)
+    
+    def _start_simulation_loop(self) -> None:
+        """Start the background event loop that runs simulation requests."""
+        self._sim_loop = asyncio.new_event_loop()
+        self._sim_semaphore = asyncio.Semaphore(self.max_concurrent_simulations)
+        self._sim_thread = threading.Thread(target=self._sim_loop.run_forever, daemon=True)
+        self._sim_thread.start()
+    
+    async def _run_simulation(self, simulation_request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a simulation request once a concurrency slot is free.
+        
+        Args:
+            simulation_request: Simulation request built by submit_strategic_simulation
             
-            return result
+        Returns:
+            Simulation results or error status
+        """
+        async with self._sim_semaphore:
+            try:
+                # In a real implementation, this would make HTTP requests to HPC system
+                result = await self._mock_simulation_request(simulation_request)
+                
+                with self._metrics_lock:
+                    self.performance_metrics["simulation_requests"] += 1
+                    if result.get("status") == "success":
+                        self.performance_metrics["simulation_successes"] += 1
+                    self._metrics_snapshot = None
+                
+                return result
+                
+            except Exception as e:
+                return {
+                    "status": "error",
+                    "message": f"Simulation failed: {str(e)}",
+                    "request_id": simulation_request["request_id"]
+                }
+    
+    def _cached_analysis(self, name: str, compute: Callable[[], Any]) -> Any:
+        """
+        Get an analysis result, computing it once per Field Twin state version.
+        
+        Args:
+            name: Analysis name
+            compute: Function computing the analysis from the current state
             
-        except Exception as e:
-            return {
-                "status": "error",
-                "message": f"Simulation failed: {str(e)}",
-                "request_id": simulation_request["request_id"]
-            }
+        Returns:
+            Analysis result
+        """
+        version = self.field_twin.state_version
+        if version != self._analysis_version:
+            self._analysis_cache.clear()
+            self._analysis_version = version
+        
+        result = self._analysis_cache.get(name)
+        if result is None:
+            result = self._analysis_cache[name] = compute()
+        return result
     
     def _generate_competitor_summary(self) -> Dict[str, Any]:
         """Generate summary of competitor states."""
         competitors = self.field_twin.competitors
+        table = self.field_twin.competitor_table
+        
+        threat_counts = np.bincount(table.threat_code, minlength=len(THREAT_NAMES))
         
         summary = {
             "total_competitors": len(competitors),
-            "threat_levels": {"low": 0, "medium": 0, "high": 0, "critical": 0},
+            "threat_levels": dict(zip(THREAT_NAMES, threat_counts.tolist())),
             "pit_probabilities": [],
             "strategic_patterns": {},
             "active_strategies": {}
         }
+        pit_probabilities = summary["pit_probabilities"]
+        active_strategies = Counter()
         
         for competitor in competitors.values():
-            # Count threat levels
-            threat_level = competitor.strategic_threat_level
-            summary["threat_levels"][threat_level] += 1
-            
             # Collect pit probabilities
-            summary["pit_probabilities"].append({
+            pit_probabilities.append({
                 "car_id": competitor.car_id,
                 "probability": competitor.pit_probability
             })
             
             # Analyze strategic patterns
-            strategy = competitor.predicted_strategy
-            if strategy not in summary["active_strategies"]:
-                summary["active_strategies"][strategy] = 0
-            summary["active_strategies"][strategy] += 1
-            
-            # Behavioral patterns
-            for behavior, value in competitor.behavioral_profile.items():
-                if behavior not in summary["strategic_patterns"]:
-                    summary["strategic_patterns"][behavior] = []
-                summary["strategic_patterns"][behavior].append(value)
-        
-        # Calculate averages for behavioral patterns
-        for behavior, values in summary["strategic_patterns"].items():
-            summary["strategic_patterns"][behavior] = {
-                "average": sum(values) / len(values) if values else 0.0,
-                "min": min(values) if values else 0.0,
-                "max": max(values) if values else 0.0
-            }
+            active_strategies[competitor.predicted_strategy] += 1
+        
+        summary["active_strategies"] = dict(active_strategies)
+        
+        # Behavioral patterns from the trait columns; the running sum keeps
+        # the left-to-right accumulation order of a per-competitor loop
+        count = len(table.car_ids)
+        if count:
+            for behavior, column in _TRAIT_COLUMNS:
+                values = getattr(table, column)
+                summary["strategic_patterns"][behavior] = {
+                    "average": float(np.add.accumulate(values)[-1]) / count,
+                    "min": float(values.min()),
+                    "max": float(values.max())
+                }
         
         return summary
     
@@ -241,34 +485,44 @@ class HPCOrchestrator:
             "overall_risk_level": "low"
         }
         
-        high_threat_count = 0
+        competitors = self.field_twin.competitors
+        table = self.field_twin.competitor_table
+        car_ids = table.car_ids
+        threat_code = table.threat_code
+        pit_prob = table.pit_prob
         
-        for competitor in self.field_twin.competitors.values():
-            threat_data = {
+        def threat_data(row: int) -> Dict[str, Any]:
+            competitor = competitors[car_ids[row]]
+            return {
                 "car_id": competitor.car_id,
                 "team": competitor.team,
                 "threat_level": competitor.strategic_threat_level,
                 "pit_probability": competitor.pit_probability,
                 "position": competitor.current_position
             }
-            
-            if competitor.strategic_threat_level == "critical":
-                threats["immediate_threats"].append(threat_data)
-                high_threat_count += 2
-            elif competitor.strategic_threat_level == "high":
-                threats["immediate_threats"].append(threat_data)
-                high_threat_count += 1
-            elif competitor.strategic_threat_level == "medium" and competitor.pit_probability > 0.6:
-                threats["emerging_threats"].append(threat_data)
-            
-            # Strategic risks
-            if (competitor.behavioral_profile["undercut_tendency"] > 0.7 and 
-                competitor.pit_probability > 0.4):
-                threats["strategic_risks"].append({
-                    "type": "undercut_risk",
-                    "car_id": competitor.car_id,
-                    "probability": competitor.pit_probability * competitor.behavioral_profile["undercut_tendency"]
-                })
+        
+        immediate = np.flatnonzero(threat_code >= Threat.HIGH)
+        emerging = np.flatnonzero((threat_code == Threat.MEDIUM) & (pit_prob > 0.6))
+        threats["immediate_threats"] = [threat_data(row) for row in immediate.tolist()]
+        threats["emerging_threats"] = [threat_data(row) for row in emerging.tolist()]
+        
+        # Critical threats weigh double
+        threat_counts = np.bincount(threat_code, minlength=len(THREAT_NAMES))
+        high_threat_count = int(threat_counts[Threat.HIGH]) + 2 * int(threat_counts[Threat.CRITICAL])
+        
+        # Strategic risks
+        undercut = np.flatnonzero(
+            (table.undercut_tend > self.undercut_risk_tendency) & (pit_prob > 0.4)
+        )
+        undercut_probs = pit_prob[undercut] * table.undercut_tend[undercut]
+        threats["strategic_risks"] = [
+            {
+                "type": "undercut_risk",
+                "car_id": car_ids[row],
+                "probability": probability
+            }
+            for row, probability in zip(undercut.tolist(), undercut_probs.tolist())
+        ]
         
         # Determine overall risk level
         if high_threat_count >= 3:
@@ -280,14 +534,26 @@ class HPCOrchestrator:
         
         return threats
     
-    def _generate_recommendations(self) -> List[Dict[str, Any]]:
-        """Generate strategic recommendations."""
+    def _generate_recommendations(self, field_state: Dict[str, Any],
+                                  threats: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Generate strategic recommendations.
+        
+        Args:
+            field_state: Current Field Twin state
+            threats: Threat assessment from _assess_threats
+            
+        Returns:
+            Strategic recommendations
+        """
         recommendations = []
+        min_probability = self.opportunity_probability_threshold
         
-        # Analyze opportunities
+        # Analyze the top 3 opportunities; the Field Twin keeps them ranked
+        # best first by probability, so no further sorting is needed
         opportunities = self.field_twin.get_strategic_opportunities()
-        for opp in opportunities[:3]:  # Top 3 opportunities
-            if opp["probability"] > 0.6:
+        for opp in opportunities[:3]:
+            if opp["probability"] > min_probability:
                 recommendations.append({
                     "type": "opportunity",
                     "priority": "high" if opp["probability"] > 0.8 else "medium",
@@ -297,8 +563,7 @@ class HPCOrchestrator:
                     "reasoning": opp.get("reasoning", "Strategic opportunity detected")
                 })
         
-        # Analyze threats and defensive recommendations
-        threats = self._assess_threats()
+        # Defensive recommendations from the threat assessment
         if threats["overall_risk_level"] in ["high", "critical"]:
             recommendations.append({
                 "type": "defensive",
@@ -309,35 +574,38 @@ class HPCOrchestrator:
             })
         
         # Pit strategy recommendations
-        field_state = self.field_twin.get_current_state()
         race_context = field_state.get("race_context", {})
         current_lap = race_context.get("current_lap", 0)
         
-        high_pit_prob_competitors = [
-            comp for comp in self.field_twin.competitors.values()
-            if comp.pit_probability > 0.7
-        ]
+        high_pit_prob_count = int(np.count_nonzero(self.field_twin.competitor_table.pit_prob > 0.7))
         
-        if len(high_pit_prob_competitors) >= 2:
+        if high_pit_prob_count >= 2:
             recommendations.append({
                 "type": "strategic",
                 "priority": "medium",
                 "action": "Monitor pit window closely",
                 "timing": f"Next 3-5 laps (laps {current_lap + 1}-{current_lap + 5})",
-                "reasoning": f"{len(high_pit_prob_competitors)} competitors likely to pit soon"
+                "reasoning": f"{high_pit_prob_count} competitors likely to pit soon"
             })
         
         return recommendations
     
-    def _analyze_race_situation(self) -> Dict[str, Any]:
-        """Analyze overall race situation."""
-        field_state = self.field_twin.get_current_state()
+    def _analyze_race_situation(self, field_state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Analyze overall race situation.
+        
+        Args:
+            field_state: Current Field Twin state
+            
+        Returns:
+            Race phase, strategic complexity, key factors and race dynamics
+        """
         race_context = field_state.get("race_context", {})
         
         situation = {
             "race_phase": self._determine_race_phase(race_context),
             "strategic_complexity": self._assess_strategic_complexity(),
-            "key_factors": self._identify_key_factors(),
+            "key_factors": self._identify_key_factors(race_context),
             "race_dynamics": self._analyze_race_dynamics()
         }
         
@@ -360,8 +628,7 @@ class HPCOrchestrator:
     def _assess_strategic_complexity(self) -> str:
         """Assess strategic complexity of current situation."""
         opportunities = len(self.field_twin.get_strategic_opportunities())
-        threats = len([c for c in self.field_twin.competitors.values() 
-                      if c.strategic_threat_level in ["high", "critical"]])
+        threats = int(np.count_nonzero(self.field_twin.competitor_table.threat_code >= Threat.HIGH))
         
         complexity_score = opportunities + threats * 2
         
@@ -374,26 +641,33 @@ class HPCOrchestrator:
         else:
             return "low"
     
-    def _identify_key_factors(self) -> List[str]:
-        """Identify key factors affecting strategy."""
+    def _identify_key_factors(self, race_context: Dict[str, Any]) -> List[str]:
+        """
+        Identify key factors affecting strategy.
+        
+        Args:
+            race_context: Race context from the current Field Twin state
+            
+        Returns:
+            Key factor names
+        """
         factors = []
         
         # Track status
-        field_state = self.field_twin.get_current_state()
-        race_context = field_state.get("race_context", {})
         track_status = race_context.get("track_status", "green")
         
         if track_status != "green":
             factors.append(f"track_status_{track_status}")
         
+        table = self.field_twin.competitor_table
+        
         # Pit window activity
-        high_pit_prob = sum(1 for c in self.field_twin.competitors.values() if c.pit_probability > 0.6)
+        high_pit_prob = np.count_nonzero(table.pit_prob > 0.6)
         if high_pit_prob >= 3:
             factors.append("active_pit_window")
         
         # Strategic threats
-        high_threats = sum(1 for c in self.field_twin.competitors.values() 
-                          if c.strategic_threat_level in ["high", "critical"])
+        high_threats = np.count_nonzero(table.threat_code >= Threat.HIGH)
         if high_threats >= 2:
             factors.append("multiple_strategic_threats")
         
@@ -415,35 +689,54 @@ class HPCOrchestrator:
     def _calculate_position_volatility(self) -> float:
         """Calculate position volatility metric."""
         # Simplified calculation - in reality would use historical position data
-        position_changes = 0
-        for competitor in self.field_twin.competitors.values():
-            if len(competitor.position_history) >= 2:
-                recent_positions = list(competitor.position_history)[-5:]
-                for i in range(1, len(recent_positions)):
-                    if recent_positions[i]["position"] != recent_positions[i-1]["position"]:
-                        position_changes += 1
+        competitors = self.field_twin.competitors
+        n = len(competitors)
+        if self._volatility_positions.shape[0] < n:
+            self._volatility_positions = np.zeros((n, VOLATILITY_WINDOW), dtype=np.int16)
+            self._volatility_lengths = np.zeros(n, dtype=np.int64)
+        positions = self._volatility_positions
+        lengths = self._volatility_lengths
+        
+        # Copy each competitor's recent positions into its buffer row
+        for i, competitor in enumerate(competitors.values()):
+            if competitor.position_history_count >= 2:
+                recent_positions = competitor.recent_positions(VOLATILITY_WINDOW)
+                positions[i, :len(recent_positions)] = recent_positions
+                lengths[i] = len(recent_positions)
+            else:
+                lengths[i] = 0
         
-        return min(1.0, position_changes / (len(self.field_twin.competitors) * 2))
+        position_changes = _count_position_changes(positions[:n], lengths[:n])
+        return min(1.0, position_changes / (n * 2))
     
     def _measure_strategic_activity(self) -> float:
         """Measure strategic activity level."""
-        recent_pit_stops = sum(1 for c in self.field_twin.competitors.values() 
-                              if len(c.pit_stops) > 0 and 
-                              (datetime.now(timezone.utc) - c.pit_stops[-1]["timestamp"]).seconds < 300)
+        table = self.field_twin.competitor_table
+        
+        # Pit stops within the recent window; rows without a pit stop hold
+        # 0.0 and fall far outside it
+        since_pit = time.time() - table.last_pit_time
+        recent_pit_stops = int(np.count_nonzero(
+            (since_pit >= 0.0) & (since_pit < self.recent_pit_window_seconds)
+        ))
         
-        high_pit_prob = sum(1 for c in self.field_twin.competitors.values() if c.pit_probability > 0.5)
+        high_pit_prob = int(np.count_nonzero(table.pit_prob > 0.5))
         
         activity_score = (recent_pit_stops * 0.3) + (high_pit_prob * 0.1)
         return min(1.0, activity_score)
     
     def _assess_competitive_pressure(self) -> float:
         """Assess competitive pressure level."""
-        close_competitors = sum(1 for c in self.field_twin.competitors.values() 
-                               if abs(c.gap_to_leader - self.field_twin.our_gap_to_leader) < 10.0)
+        table = self.field_twin.competitor_table
+        if not table.car_ids:
+            return 0.0
         
-        threat_level_scores = {"low": 0.1, "medium": 0.3, "high": 0.6, "critical": 1.0}
-        threat_pressure = sum(threat_level_scores.get(c.strategic_threat_level, 0) 
-                             for c in self.field_twin.competitors.values())
+        close_competitors = int(np.count_nonzero(
+            np.abs(table.gap - self.field_twin.our_gap_to_leader) < self.close_gap_seconds
+        ))
+        
+        # Running sum in competitor order, matching a sequential Python sum
+        threat_pressure = float(np.cumsum(_THREAT_PRESSURE_SCORES[table.threat_code])[-1])
         
         pressure_score = (close_competitors * 0.1) + (threat_pressure * 0.1)
         return min(1.0, pressure_score)
@@ -451,8 +744,8 @@ class HPCOrchestrator:
     def _calculate_prediction_confidence(self, competitor) -> Dict[str, float]:
         """Calculate prediction confidence factors."""
         return {
-            "data_quality": min(1.0, len(competitor.lap_times_history) / 10.0),
-            "behavioral_consistency": competitor.behavioral_profile["tire_management"],
+            "data_quality": min(1.0, competitor.lap_history_count / 10.0),
+            "behavioral_consistency": competitor.behavioral_profile.tire_management,
             "historical_accuracy": 0.8,  # Would be calculated from past predictions
             "situational_stability": 1.0 - competitor.pit_probability
         }
@@ -462,30 +755,51 @@ class HPCOrchestrator:
         if not self.hpc_enabled:
             return
         
-        # Check for high-priority strategic opportunities
+        # Check for high-priority strategic opportunities; they lead the
+        # list, which the Field Twin keeps ranked best first by probability
         opportunities = self.field_twin.get_strategic_opportunities()
-        high_value_opportunities = [opp for opp in opportunities if opp["probability"] > 0.8]
+        min_probability = self.simulation_opportunity_threshold
+        high_value_opportunities = list(
+            takewhile(lambda opp: opp["probability"] > min_probability, opportunities)
+        )
         
         if len(high_value_opportunities) > 0:
-            self.trigger_strategic_simulation("opportunity_analysis", {
+            self._trigger_simulation("opportunity_analysis", {
                 "opportunities": high_value_opportunities,
                 "trigger_reason": "high_probability_opportunities"
             })
         
         # Check for critical threats
-        critical_threats = [c for c in self.field_twin.competitors.values() 
-                           if c.strategic_threat_level == "critical"]
+        table = self.field_twin.competitor_table
+        critical_rows = np.flatnonzero(table.threat_code == Threat.CRITICAL)
         
-        if len(critical_threats) >= 2:
-            self.trigger_strategic_simulation("threat_response", {
-                "threats": [c.car_id for c in critical_threats],
+        if len(critical_rows) >= self.simulation_critical_threats:
+            self._trigger_simulation("threat_response", {
+                "threats": [table.car_ids[row] for row in critical_rows.tolist()],
                 "trigger_reason": "multiple_critical_threats"
             })
     
-    def _mock_simulation_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+    def _trigger_simulation(self, scenario: str, parameters: Dict[str, Any]) -> None:
+        """
+        Submit a triggered simulation unless one for the scenario is pending.
+        
+        Triggers fire on every update, so this bounds the simulation backlog
+        to one pending request per scenario.
+        
+        Args:
+            scenario: Simulation scenario type
+            parameters: Simulation parameters
+        """
+        pending = self._triggered_simulations.get(scenario)
+        if pending is not None and not pending.done():
+            return
+        
+        self._triggered_simulations[scenario] = self.submit_strategic_simulation(scenario, parameters)
+    
+    async def _mock_simulation_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Mock HPC simulation request for testing."""
         # Simulate processing time
-        time.sleep(0.1)
+        await asyncio.sleep(0.1)
         
         return {
             "status": "success",
@@ -499,31 +813,169 @@ class HPCOrchestrator:
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
+    def _build_state_snapshot(self) -> Dict[str, Any]:
+        """
+        Build the state snapshot written by the persistence thread.
+        
+        Returns:
+            Field Twin state with orchestrator metrics and update count
+        """
+        return {
+            "field_twin_state": self.field_twin.get_current_state(),
+            "orchestrator_metrics": self._get_metrics_snapshot(),
+            "last_update": self.last_update_time.isoformat() if self.last_update_time else None,
+            "update_count": self.update_count
+        }
+    
     def _persist_state(self) -> None:
-        """Persist Field Twin state to file."""
+        """Queue a Field Twin state snapshot for the persistence thread."""
         try:
-            state_data = {
-                "field_twin_state": self.field_twin.get_current_state(),
-                "orchestrator_metrics": self.performance_metrics,
-                "last_update": self.last_update_time.isoformat() if self.last_update_time else None,
-                "update_count": self.update_count
-            }
+            state_data = self._build_state_snapshot()
+            
+            if self._persistence_thread is None:
+                self._start_persistence_thread()
+            
+            # Replace a snapshot the writer has not picked up yet
+            try:
+                self._persist_queue.put_nowait(state_data)
+            except queue.Full:
+                try:
+                    self._persist_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self._persist_queue.put_nowait(state_data)
+                
+        except Exception as e:
+            print(f"Warning: Failed to persist Field Twin state: {e}")
+    
+    def _start_persistence_thread(self) -> None:
+        """Start the background state persistence thread."""
+        def persistence_loop():
+            while True:
+                state_data = self._persist_queue.get()
+                if state_data is None:
+                    break  # Shutdown requested
+                self._write_state_file(state_data)
+        
+        self._persistence_thread = threading.Thread(target=persistence_loop, daemon=True)
+        self._persistence_thread.start()
+    
+    def _write_state_file(self, state_data: Dict[str, Any]) -> None:
+        """
+        Persist a state snapshot, either in full or as a journal record.
+        
+        Each competitor is encoded on its own and compared with the bytes
+        last written for it; the Field Twin rebuilds competitor dictionaries
+        on every update, so only the encoded values tell whether a competitor
+        changed. Unchanged competitors are left out of the journal record.
+        
+        A digest of the encoded competitors and the other Field Twin state
+        sections is kept; when it matches the last written one, nothing but
+        update bookkeeping changed and no record is written.
+        
+        Args:
+            state_data: State snapshot queued by _persist_state
+        """
+        try:
+            field_state = state_data["field_twin_state"]
+            competitors = field_state.get("competitors", [])
+            encoded = {c["car_id"]: json_dumpb(c) for c in competitors}
             
-            with open(self.state_file, 'w') as f:
-                json.dump(state_data, f, indent=2, default=str)
+            content = hashlib.blake2b(digest_size=16)
+            for competitor_bytes in encoded.values():
+                content.update(competitor_bytes)
+            content.update(json_dumpb([field_state.get(key) for key in _PERSISTED_CONTENT_KEYS]))
+            digest = content.digest()
+            
+            if (self._written_competitors is None
+                    or self._journal_length >= self.state_snapshot_interval):
+                # Full snapshot, replacing the state file and starting a new journal
+                temp_file = self.state_file.with_suffix('.tmp')
+                temp_file.write_bytes(json_dumpb(state_data))
+                temp_file.replace(self.state_file)
+                if self._journal_fd is None:
+                    self._journal_fd = os.open(
+                        self.journal_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND | os.O_TRUNC,
+                        0o644
+                    )
+                else:
+                    os.ftruncate(self._journal_fd, 0)
                 
+                self._written_competitors = encoded
+                self._written_digest = digest
+                self._journal_length = 0
+                return
+            
+            if digest == self._written_digest:
+                return  # Nothing changed since the last write
+            
+            written = self._written_competitors
+            changed = [c for c in competitors if written.get(c["car_id"]) != encoded[c["car_id"]]]
+            record = dict(state_data)
+            record["field_twin_state"] = {**field_state, "competitors": changed}
+            os.write(self._journal_fd, json_dumpb(record, newline=True))
+            
+            for competitor in changed:
+                written[competitor["car_id"]] = encoded[competitor["car_id"]]
+            self._written_digest = digest
+            self._journal_length += 1
+            
         except Exception as e:
+            self._written_competitors = None  # Start over from a full snapshot
             print(f"Warning: Failed to persist Field Twin state: {e}")
     
+    def shutdown(self) -> None:
+        """
+        Stop background work.
+        
+        Waits briefly for pending simulations and cancels any still
+        unfinished, so their futures resolve as cancelled, then stops the
+        simulation loop and the persistence thread after writing any pending
+        state snapshot. A later simulation request starts a new loop.
+        """
+        # Detach the loop under the lock; waiting happens outside it, since
+        # finished simulations take the lock to leave the pending set
+        with self._sim_lock:
+            loop, thread = self._sim_loop, self._sim_thread
+            pending = list(self._sim_futures)
+            self._sim_loop = None
+            self._sim_thread = None
+            self._triggered_simulations.clear()
+        
+        if loop is not None:
+            wait(pending, timeout=5)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            
+            if thread.is_alive():
+                print("Warning: Simulation loop did not stop; leaving it to exit with the process")
+            else:
+                # Let the remaining requests finish cancelling on the stopped loop
+                remaining = asyncio.all_tasks(loop)
+                for task in remaining:
+                    task.cancel()
+                if remaining:
+                    loop.run_until_complete(asyncio.gather(*remaining, return_exceptions=True))
+                loop.close()
+        
+        if self._persistence_thread and self._persistence_thread.is_alive():
+            self._persist_queue.put(None)
+            self._persistence_thread.join(timeout=5)
+        self._persistence_thread = None
+        
+        if self._journal_fd is not None:
+            os.close(self._journal_fd)
+            self._journal_fd = None
+            self._written_competitors = None  # Reopen with a full snapshot
+    
     def _load_previous_state(self) -> None:
         """Load previous Field Twin state if available."""
         try:
-            if self.state_file.exists():
-                with open(self.state_file, 'r') as f:
-                    state_data = json.load(f)
-                
+            state_data = self._read_persisted_state()
+            if state_data is not None:
                 # Restore orchestrator metrics
                 self.performance_metrics.update(state_data.get("orchestrator_metrics", {}))
+                self._metrics_snapshot = None
                 self.update_count = state_data.get("update_count", 0)
                 
                 print(f"Loaded previous Field Twin state with {self.update_count} updates")
@@ -531,20 +983,72 @@ class HPCOrchestrator:
         except Exception as e:
             print(f"Warning: Failed to load previous state: {e}")
     
+    def _read_persisted_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the last persisted state, replaying the journal over the snapshot.
+        
+        Returns:
+            Latest persisted state, or None if nothing has been persisted
+        """
+        state_data = None
+        if self.state_file.exists():
+            # Parse straight from the mapped file instead of reading a copy
+            with open(self.state_file, "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                    memoryview(mapped) as view:
+                state_data = json_loads(view)
+        if state_data is None or not self.journal_file.exists():
+            return state_data
+        
+        competitors = {
+            c["car_id"]: c for c in state_data["field_twin_state"].get("competitors", [])
+        }
+        for line in self.journal_file.read_bytes().splitlines():
+            try:
+                record = json_loads(line)
+            except ValueError:
+                break  # Incomplete final record
+            
+            # Records older than the snapshot are left over from before it was written
+            if record.get("update_count", 0) < state_data.get("update_count", 0):
+                continue
+            
+            for competitor in record["field_twin_state"]["competitors"]:
+                competitors[competitor["car_id"]] = competitor
+            state_data = record
+        
+        state_data["field_twin_state"]["competitors"] = list(competitors.values())
+        return state_data
+    
     def _update_performance_metrics(self, update_time_ms: float) -> None:
         """Update performance metrics."""
-        self.performance_metrics["total_updates"] += 1
+        with self._metrics_lock:
+            self.performance_metrics["total_updates"] += 1
+            
+            # Calculate running average
+            total = self.performance_metrics["total_updates"]
+            current_avg = self.performance_metrics["avg_update_time_ms"]
+            new_avg = ((current_avg * (total - 1)) + update_time_ms) / total
+            self.performance_metrics["avg_update_time_ms"] = new_avg
+            self._metrics_snapshot = None
+    
+    def _get_metrics_snapshot(self) -> Dict[str, Any]:
+        """
+        Get a copy of the performance metrics shared until they next change.
         
-        # Calculate running average
-        total = self.performance_metrics["total_updates"]
-        current_avg = self.performance_metrics["avg_update_time_ms"]
-        new_avg = ((current_avg * (total - 1)) + update_time_ms) / total
-        self.performance_metrics["avg_update_time_ms"] = new_avg
+        Returns:
+            Performance metrics snapshot, to be treated as read-only
+        """
+        with self._metrics_lock:
+            snapshot = self._metrics_snapshot
+            if snapshot is None:
+                snapshot = self._metrics_snapshot = dict(self.performance_metrics)
+        return snapshot
     
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Get orchestrator performance metrics."""
         return {
-            **self.performance_metrics,
+            **self._get_metrics_snapshot(),
             "field_twin_metrics": self.field_twin.get_performance_metrics(),
             "competitor_count": self.field_twin.get_competitor_count(),
             "last_update": self.last_update_time.isoformat() if self.last_update_time else None
@@ -14,6 +14,7 @@ from pathlib import Path
 from core.base_state import BaseStateManager
 from core.interfaces import StateManager, StateConsistencyError
 from utils.config import get_config
+from utils.json_codec import json_dumps
 from twin_system.system_recovery import SystemRecoveryManager, RecoveryLevel, AuditEventType
 
 
@@ -542,14 +543,12 @@ class StateHandler(BaseStateManager):
             telemetry_path = Path(telemetry_output_file)
             telemetry_path.parent.mkdir(parents=True, exist_ok=True)
             
-            import json
-            
             # Write telemetry state
             telemetry_state = self.get_telemetry_state()
             if telemetry_state:
                 temp_file = telemetry_path.with_suffix('.tmp')
                 with open(temp_file, 'w') as f:
-                    json.dump(telemetry_state, f, indent=2)
+                    f.write(json_dumps(telemetry_state, indent=True))
                 temp_file.replace(telemetry_path)
             
             # Write car twin state
@@ -558,7 +557,7 @@ class StateHandler(BaseStateManager):
             if car_twin_state:
                 temp_file = car_twin_path.with_suffix('.tmp')
                 with open(temp_file, 'w') as f:
-                    json.dump(car_twin_state, f, indent=2)
+                    f.write(json_dumps(car_twin_state, indent=True))
                 temp_file.replace(car_twin_path)
             
             # Write field twin state
@@ -567,7 +566,7 @@ class StateHandler(BaseStateManager):
             if field_twin_state:
                 temp_file = field_twin_path.with_suffix('.tmp')
                 with open(temp_file, 'w') as f:
-                    json.dump(field_twin_state, f, indent=2)
+                    f.write(json_dumps(field_twin_state, indent=True))
                 temp_file.replace(field_twin_path)
             
         except Exception as e:
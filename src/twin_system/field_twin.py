@@ -5,15 +5,545 @@ This module implements the Field Twin component that tracks competitor behavior,
 analyzes strategic patterns, and identifies opportunities for strategic advantage.
 """
 
+import heapq
 import json
 import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, List, Optional, Tuple
-from collections import defaultdict, deque
+from enum import IntEnum
+from typing import Dict, Any, List, Optional, Tuple, Callable
+from collections import Counter, defaultdict, deque
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+
+import numpy as np
 
 from core.base_twin import BaseTwinModel
 from core.interfaces import TwinModelError
 from utils.config import get_config
+from utils.jit import njit, prange, NUMBA_AVAILABLE
+
+
+# Shared read-only default for missing nested telemetry sections
+_EMPTY_DICT: Dict[str, Any] = {}
+
+# History ring buffer sizes
+LAP_HISTORY_SIZE = 20       # Last 20 laps
+POSITION_HISTORY_SIZE = 50  # Last 50 position updates
+RECENT_LAP_WINDOW = 5       # Laps averaged for recent performance
+
+# Race event log sizes
+RACE_EVENT_HISTORY_SIZE = 1000  # Events kept in the race event log
+RECENT_EVENTS_SIZE = 10         # Events included in the twin state
+
+# Maximum number of laps ahead evaluated for pit timing predictions
+PIT_LOOKAHEAD_LAPS = 19
+
+
+class Compound(IntEnum):
+    """Tire compound codes recorded in lap history."""
+    UNKNOWN = 0
+    SOFT = 1
+    MEDIUM = 2
+    HARD = 3
+    INTERMEDIATE = 4
+    WET = 5
+
+
+# Tire compounds recorded in lap history; anything else is stored as "unknown"
+TIRE_COMPOUNDS = ("unknown", "soft", "medium", "hard", "intermediate", "wet")
+_COMPOUND_IDS = {compound: index for index, compound in enumerate(TIRE_COMPOUNDS)}
+
+# Lap history record layout
+LAP_DTYPE = np.dtype([
+    ("lap_time", np.float64),
+    ("tire_age", np.int16),
+    ("compound", np.uint8),
+    ("ts", np.float64),
+])
+
+# Predicted lap time evolution record layout, one record per lap ahead
+LAP_PREDICTION_DTYPE = np.dtype([
+    ("lap_offset", np.int32),
+    ("predicted_lap_time", np.float64),
+    ("tire_age", np.int32),
+    ("degradation_impact", np.float64),
+])
+
+
+def _ring_tail(buffer: np.ndarray, head: int, count: int, n: int) -> np.ndarray:
+    """
+    Get the most recent entries of a ring buffer in insertion order.
+    
+    Args:
+        buffer: Ring buffer storage
+        head: Index of the next write
+        count: Number of valid entries in the buffer
+        n: Maximum number of entries to return
+        
+    Returns:
+        Array of at most ``n`` entries, oldest first
+    """
+    n = min(n, count)
+    start = head - n
+    if start >= 0:
+        return buffer[start:head]
+    return np.concatenate((buffer[start:], buffer[:head]))
+
+
+class Strategy(IntEnum):
+    """Predicted pit strategy codes."""
+    UNKNOWN = 0
+    ONE_STOP = 1
+    TWO_STOP = 2
+    THREE_STOP = 3
+
+
+STRATEGY_NAMES = ("unknown", "one_stop", "two_stop", "three_stop")
+_STRATEGY_CODES = {name: code for code, name in enumerate(STRATEGY_NAMES)}
+
+# Strategy pit windows as (strategy, pit stops made, start, end, factor), with
+# start and end given as fractions of the race distance (inclusive)
+STRATEGY_PIT_WINDOWS = (
+    (Strategy.TWO_STOP, 0, 0.30, 0.50, 0.7),  # First pit window for two-stop
+    (Strategy.TWO_STOP, 0, 0.52, 0.70, 0.4),
+    (Strategy.TWO_STOP, 1, 0.70, 0.90, 0.8),  # Second pit window for two-stop
+    (Strategy.ONE_STOP, 0, 0.50, 0.80, 0.6),  # Single pit window
+)
+STRATEGY_FACTOR_MAX_PITS = 3
+
+
+@lru_cache(maxsize=8)
+def build_strategy_factor_table(total_laps: int) -> np.ndarray:
+    """
+    Build the strategy-based pit factor table for a race distance.
+    
+    Args:
+        total_laps: Total race laps
+        
+    Returns:
+        Read-only array indexed by [strategy code, pit stops made, lap]
+    """
+    total_laps = max(int(total_laps), 1)
+    table = np.zeros(
+        (len(Strategy), STRATEGY_FACTOR_MAX_PITS + 1, total_laps + 1), dtype=np.float64
+    )
+    for strategy, pit_count, start, end, factor in STRATEGY_PIT_WINDOWS:
+        first_lap = int(round(start * total_laps))
+        last_lap = int(round(end * total_laps))
+        table[strategy, pit_count, first_lap:last_lap + 1] = factor
+    table.flags.writeable = False
+    return table
+
+
+# Tapered pit windows used when predicting future pit laps, as (strategy, pit
+# stops made, first lap, last lap, centre lap, peak factor, taper per lap).
+# Laps are given for a reference race of PIT_WINDOW_REFERENCE_LAPS and scaled
+# to the actual race distance; the taper per lap is not scaled.
+PIT_WINDOW_REFERENCE_LAPS = 50
+PIT_WINDOW_TAPERS = (
+    (Strategy.TWO_STOP, 0, 15, 35, 25, 0.7, 0.02),  # First pit window for two-stop
+    (Strategy.TWO_STOP, 1, 35, 50, 42, 0.8, 0.03),  # Second pit window for two-stop
+    (Strategy.ONE_STOP, 0, 25, 40, 32, 0.6, 0.02),  # Single pit window
+)
+
+
+@lru_cache(maxsize=8)
+def build_pit_window_factor_table(total_laps: int) -> np.ndarray:
+    """
+    Build the tapered strategy factor table used for pit window predictions.
+    
+    Args:
+        total_laps: Total race laps
+    
+    Returns:
+        Read-only array indexed by [strategy code, pit stops made, lap]
+    """
+    total_laps = max(int(total_laps), 1)
+    table = np.zeros(
+        (len(Strategy), STRATEGY_FACTOR_MAX_PITS + 1, total_laps + 1), dtype=np.float64
+    )
+    for strategy, pit_count, first, last, centre, peak, taper in PIT_WINDOW_TAPERS:
+        first_lap = int(round(first * total_laps / PIT_WINDOW_REFERENCE_LAPS))
+        last_lap = int(round(last * total_laps / PIT_WINDOW_REFERENCE_LAPS))
+        centre_lap = int(round(centre * total_laps / PIT_WINDOW_REFERENCE_LAPS))
+        for lap in range(first_lap, min(last_lap, total_laps) + 1):
+            table[strategy, pit_count, lap] = peak - (abs(lap - centre_lap) * taper)
+    table.flags.writeable = False
+    return table
+
+
+class Threat(IntEnum):
+    """Strategic threat level codes, ordered by severity."""
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+    CRITICAL = 3
+
+
+THREAT_NAMES = ("low", "medium", "high", "critical")
+_THREAT_CODES = {name: code for code, name in enumerate(THREAT_NAMES)}
+
+# Per-threat-code weights used when scoring strategic values and risks
+_THREAT_VALUE_FACTORS = np.array([0.2, 0.5, 0.8, 1.0])
+_THREAT_RISK_MULTIPLIERS = (0.5, 0.7, 0.9, 1.0)
+
+# Plain int copy of the threat code for use inside JIT-compiled kernels
+_THREAT_HIGH = int(Threat.HIGH)
+
+# Competitor response pattern templates, copied with the probability filled in
+_UNDERCUT_RESPONSE_PATTERN = {
+    "trigger": "undercut_attempt",
+    "response": "early_pit_counter",
+    "probability": 0.0,
+    "effectiveness": 0.7
+}
+_OVERCUT_RESPONSE_PATTERN = {
+    "trigger": "overcut_attempt",
+    "response": "extend_stint",
+    "probability": 0.0,
+    "effectiveness": 0.6
+}
+
+
+@njit(cache=True)
+def _behavioral_update(lap_times: np.ndarray, positions: np.ndarray,
+                       tire_management: float, aggressive_defense: float) -> Tuple[float, float]:
+    """
+    Blend recent lap time consistency and position volatility into the profile.
+    
+    Args:
+        lap_times: Up to 10 most recent lap times, oldest first
+        positions: Up to 10 most recent positions, oldest first
+        tire_management: Current tire management score
+        aggressive_defense: Current aggressive defense score
+        
+    Returns:
+        Updated (tire_management, aggressive_defense) scores
+    """
+    if lap_times.shape[0] >= 5:
+        time_variance = lap_times.max() - lap_times.min()
+        # Lower variance indicates better tire management
+        tire_mgmt_score = max(0.0, 1.0 - (time_variance / 5.0))
+        tire_management = tire_management * 0.8 + tire_mgmt_score * 0.2
+    
+    if positions.shape[0] >= 10:
+        avg_position_change = np.abs(np.diff(positions.astype(np.float64))).mean()
+        # Higher position volatility suggests more aggressive racing
+        aggression_score = min(1.0, avg_position_change / 2.0)
+        aggressive_defense = aggressive_defense * 0.9 + aggression_score * 0.1
+    
+    return tire_management, aggressive_defense
+
+
+@njit(cache=True)
+def _pit_probability(tire_age: int, tire_wear: float, fuel_level: float,
+                     strategy_factor: float) -> float:
+    """
+    Probability of a competitor pitting in the next 5 laps.
+    
+    Args:
+        tire_age: Current tire age in laps
+        tire_wear: Current tire wear level
+        fuel_level: Current fuel level (0.0 to 1.0)
+        strategy_factor: Strategy-based factor, see ``build_strategy_factor_table``
+        
+    Returns:
+        Pit probability (0.0 to 1.0)
+    """
+    # Base probability on tire age and wear
+    tire_factor = min(1.0, (tire_age / 25.0) + (tire_wear * 0.5))
+    
+    # Fuel factor
+    fuel_factor = max(0.0, 1.0 - (fuel_level / 0.3))  # High probability if fuel < 30%
+    
+    # Combine factors
+    return min(1.0, tire_factor * 0.4 + strategy_factor * 0.4 + fuel_factor * 0.2)
+
+
+# Threat code indexed by [position bucket, gap bucket, aggressive]. Position
+# buckets: adjacent (<= 1), close (<= 3), distant. Gap buckets: within 5
+# seconds, within the 15 second pit window, beyond it. Aggressive means likely
+# to pit (> 0.6) or a strong undercut tendency (> 0.7).
+_THREAT_TABLE = np.array([
+    [[Threat.MEDIUM, Threat.HIGH], [Threat.MEDIUM, Threat.MEDIUM], [Threat.LOW, Threat.LOW]],
+    [[Threat.MEDIUM, Threat.MEDIUM], [Threat.MEDIUM, Threat.MEDIUM], [Threat.MEDIUM, Threat.MEDIUM]],
+    [[Threat.LOW, Threat.LOW], [Threat.LOW, Threat.LOW], [Threat.LOW, Threat.LOW]],
+], dtype=np.int8)
+
+
+@njit(cache=True)
+def _threat_level(position_diff: int, abs_gap: float, pit_probability: float,
+                  undercut_tendency: float, tire_age: int) -> int:
+    """
+    Strategic threat code of a competitor relative to our car.
+    
+    Args:
+        position_diff: Absolute position difference to our car
+        abs_gap: Absolute gap to our car in seconds
+        pit_probability: Competitor pit probability
+        undercut_tendency: Competitor undercut tendency score
+        tire_age: Competitor tire age in laps
+        
+    Returns:
+        ``Threat`` code
+    """
+    position_bucket = (1 if position_diff > 1 else 0) + (1 if position_diff > 3 else 0)
+    gap_bucket = (0 if abs_gap < 5.0 else 1) + (0 if abs_gap < 15.0 else 1)
+    aggressive = 1 if (pit_probability > 0.6 or undercut_tendency > 0.7) else 0
+    threat = int(_THREAT_TABLE[position_bucket, gap_bucket, aggressive])
+    
+    # Upgrade threat one level (up to high) if competitor is on fresher tires
+    if tire_age < 5 and threat < _THREAT_HIGH:
+        threat += 1
+    
+    return threat
+
+
+@njit(parallel=True, cache=True)
+def _batch_pit_and_threat(tire_ages: np.ndarray, tire_wears: np.ndarray,
+                          fuel_levels: np.ndarray, strategy_codes: np.ndarray,
+                          pit_counts: np.ndarray, positions: np.ndarray,
+                          gaps: np.ndarray, undercut_tendencies: np.ndarray,
+                          strategy_factor_table: np.ndarray, current_lap: int,
+                          our_position: int, our_gap_to_leader: float,
+                          out_probs: np.ndarray, out_threats: np.ndarray) -> None:
+    """
+    Compute pit probability and threat level for a batch of competitors.
+    
+    Args:
+        tire_ages: Tire age per competitor
+        tire_wears: Tire wear per competitor
+        fuel_levels: Fuel level per competitor
+        strategy_codes: Predicted strategy code per competitor
+        pit_counts: Pit stops made per competitor
+        positions: Race position per competitor
+        gaps: Gap to leader per competitor
+        undercut_tendencies: Undercut tendency score per competitor
+        strategy_factor_table: Table from ``build_strategy_factor_table``
+        current_lap: Current race lap
+        our_position: Our current position
+        our_gap_to_leader: Our gap to the leader
+        out_probs: Output pit probabilities
+        out_threats: Output threat codes
+    """
+    max_pits = strategy_factor_table.shape[1] - 1
+    lap = min(max(current_lap, 0), strategy_factor_table.shape[2] - 1)
+    for i in prange(tire_ages.shape[0]):
+        strategy_factor = strategy_factor_table[
+            strategy_codes[i], min(pit_counts[i], max_pits), lap
+        ]
+        probability = _pit_probability(tire_ages[i], tire_wears[i], fuel_levels[i],
+                                       strategy_factor)
+        out_probs[i] = probability
+        out_threats[i] = _threat_level(
+            abs(positions[i] - our_position), abs(gaps[i] - our_gap_to_leader),
+            probability, undercut_tendencies[i], tire_ages[i]
+        )
+
+
+@njit(cache=True)
+def _pit_window_kernel(lap_offsets: np.ndarray, current_lap: int, tire_age: int,
+                       tire_wear: float, fuel_level: float, fuel_per_lap: float,
+                       strategy_code: int, pit_count: int, strategy_factor_table: np.ndarray
+                       ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Evaluate a competitor's pit probability for each look-ahead lap.
+    
+    Args:
+        lap_offsets: Laps ahead of the current lap to evaluate
+        current_lap: Current race lap
+        tire_age: Current tire age in laps
+        tire_wear: Current tire wear level
+        fuel_level: Current fuel level (0.0 to 1.0)
+        fuel_per_lap: Fuel used per lap (0.0 to 1.0)
+        strategy_code: Predicted ``Strategy`` code
+        pit_count: Pit stops made so far
+        strategy_factor_table: Table from ``build_pit_window_factor_table``
+        
+    Returns:
+        Per-lap (pit probability, tire factor, strategy factor, predicted fuel)
+    """
+    n = lap_offsets.shape[0]
+    strategy_factors_by_lap = strategy_factor_table[
+        strategy_code, min(pit_count, strategy_factor_table.shape[1] - 1)
+    ]
+    last_lap = strategy_factors_by_lap.shape[0] - 1
+    pit_probs = np.empty(n)
+    tire_factors = np.empty(n)
+    strategy_factors = np.empty(n)
+    predicted_fuels = np.empty(n)
+    for i in range(n):
+        offset = lap_offsets[i]
+        future_lap = current_lap + offset
+        tire_factor = min(1.0, ((tire_age + offset) / 25.0) + (tire_wear * 0.5))
+        
+        # Strategy-based probability, none outside the race distance
+        strategy_factor = 0.0
+        if 0 <= future_lap <= last_lap:
+            strategy_factor = strategy_factors_by_lap[future_lap]
+        
+        # Fuel urgency, critical below 20%
+        predicted_fuel = max(0.0, fuel_level - (fuel_per_lap * offset))
+        fuel_factor = max(0.0, 1.0 - (predicted_fuel / 0.2))
+        
+        pit_probs[i] = min(1.0, tire_factor * 0.4 + strategy_factor * 0.4 + fuel_factor * 0.2)
+        tire_factors[i] = tire_factor
+        strategy_factors[i] = strategy_factor
+        predicted_fuels[i] = predicted_fuel
+    return pit_probs, tire_factors, strategy_factors, predicted_fuels
+
+
+@njit(parallel=True, cache=True)
+def _predict_field(lap_offsets: np.ndarray, current_lap: int, tire_ages: np.ndarray,
+                   last_lap_times: np.ndarray, degradation_rates: np.ndarray,
+                   fuel_rates: np.ndarray, fuel_levels: np.ndarray, lap_counts: np.ndarray,
+                   position_counts: np.ndarray, pit_counts: np.ndarray,
+                   tire_managements: np.ndarray, out_degradation: np.ndarray,
+                   out_lap_times: np.ndarray, out_fuel_critical: np.ndarray,
+                   out_strategy_conf: np.ndarray, out_behavior_conf: np.ndarray) -> None:
+    """
+    Per-competitor prediction values for the whole field in one pass.
+    
+    Computes lap time evolution, the fuel-critical lap and the strategy and
+    behavior confidences from the same row of competitor columns.
+    
+    Args:
+        lap_offsets: Laps ahead of the current lap, length L
+        current_lap: Current race lap
+        tire_ages: Current tire age per competitor
+        last_lap_times: Last lap time per competitor, 0 when unknown
+        degradation_rates: Lap time lost per lap of tire age per competitor
+        fuel_rates: Fuel used per lap in percent per competitor
+        fuel_levels: Current fuel level per competitor
+        lap_counts: Lap history length per competitor
+        position_counts: Position history length per competitor
+        pit_counts: Pit stops made per competitor
+        tire_managements: Tire management score per competitor
+        out_degradation: Output (C, L) tire degradation
+        out_lap_times: Output (C, L) predicted lap times
+        out_fuel_critical: Output fuel-critical lap, -1 when never critical
+        out_strategy_conf: Output strategy prediction confidence
+        out_behavior_conf: Output behavior prediction confidence
+    """
+    for i in prange(tire_ages.shape[0]):
+        # Lap time evolution, with the competitor's row loaded once
+        base_time = last_lap_times[i] if last_lap_times[i] > 0 else 85.0
+        tire_age = tire_ages[i]
+        degradation_rate = degradation_rates[i]
+        fuel_rate = fuel_rates[i]
+        for j in range(lap_offsets.shape[0]):
+            offset = lap_offsets[j]
+            degradation = (tire_age + offset) * degradation_rate
+            fuel_benefit = (offset * fuel_rate / 100.0) * 0.3
+            out_degradation[i, j] = degradation
+            out_lap_times[i, j] = base_time + degradation - fuel_benefit
+        
+        # Fuel-critical lap (5% fuel remaining)
+        fuel_per_lap = fuel_rate / 100.0
+        if fuel_levels[i] <= 0.1:
+            out_fuel_critical[i] = current_lap
+        elif fuel_per_lap <= 0.0:
+            out_fuel_critical[i] = -1
+        else:
+            laps_to_critical = (fuel_levels[i] - 0.05) / fuel_per_lap
+            out_fuel_critical[i] = current_lap + int(laps_to_critical) if laps_to_critical > 0 else -1
+        
+        # Prediction confidences
+        data_quality = min(1.0, lap_counts[i] / 10.0)
+        pit_history_factor = min(1.0, pit_counts[i] * 0.3)
+        out_strategy_conf[i] = (data_quality + tire_managements[i] + pit_history_factor) / 3.0
+        out_behavior_conf[i] = min(1.0, position_counts[i] / 20.0)
+
+
+@njit(cache=True)
+def _strategic_value_core(position: int, threat_code: int, strategy_factor: float) -> float:
+    """
+    Strategic value of an undercut or overcut window against a competitor.
+    
+    Args:
+        position: Competitor's current position
+        threat_code: Competitor's ``Threat`` code
+        strategy_factor: Strategy-specific behavioral factor
+        
+    Returns:
+        Strategic value (0.0 to 1.0)
+    """
+    base_value = 0.5
+    position_factor = max(0.0, (10 - position) / 10.0)
+    threat_factor = _THREAT_VALUE_FACTORS[threat_code]
+    return min(1.0, base_value + position_factor * 0.3 + threat_factor * 0.2 + strategy_factor * 0.2)
+
+
+@njit(cache=True)
+def _isolation_risk_core(similar_strategies: int, total_competitors: int,
+                         our_position: int) -> float:
+    """
+    Risk of being strategically isolated from the rest of the field.
+    
+    Args:
+        similar_strategies: Competitors on the same strategy as us
+        total_competitors: Competitors tracked
+        our_position: Our current position
+        
+    Returns:
+        Isolation risk (0.0 to 1.0)
+    """
+    if total_competitors == 0:
+        return 0.0
+    
+    # High isolation risk if we're alone in our strategy
+    isolation_factor = 1.0 - (similar_strategies / total_competitors)
+    
+    # Adjust for track position
+    position_factor = min(1.0, our_position / 10.0)  # Higher positions = higher risk
+    
+    return min(1.0, isolation_factor * 0.7 + position_factor * 0.3)
+
+
+class BehavioralProfile:
+    """
+    Behavioral tendencies of a competitor, each in the range 0.0-1.0.
+    
+    Hot paths read the tendencies as attributes. Subscripting by name is
+    kept for read access and ``to_dict`` gives the serialized form.
+    """
+    
+    __slots__ = ("undercut_tendency", "aggressive_defense", "tire_management")
+    
+    def __init__(self, undercut_tendency: float = 0.5, aggressive_defense: float = 0.5,
+                 tire_management: float = 0.5):
+        """
+        Initialize behavioral profile.
+        
+        Args:
+            undercut_tendency: Tendency to attempt undercuts
+            aggressive_defense: Tendency to defend position aggressively
+            tire_management: Consistency of tire management
+        """
+        self.undercut_tendency = undercut_tendency
+        self.aggressive_defense = aggressive_defense
+        self.tire_management = tire_management
+    
+    def __getitem__(self, name: str) -> float:
+        """Get a tendency value by name."""
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+    
+    def to_dict(self) -> Dict[str, float]:
+        """
+        Get profile as a dictionary.
+        
+        Returns:
+            Tendency values keyed by name
+        """
+        return {
+            "undercut_tendency": self.undercut_tendency,
+            "aggressive_defense": self.aggressive_defense,
+            "tire_management": self.tire_management
+        }
 
 
 class CompetitorModel:
@@ -23,7 +553,22 @@ class CompetitorModel:
     Tracks state, strategy patterns, and behavioral tendencies for a single competitor.
     """
     
-    def __init__(self, car_id: str, team: str, driver: str):
+    __slots__ = (
+        "car_id", "team", "driver", "_on_pit",
+        "current_position", "gap_to_leader", "speed", "tire_compound", "_compound_code",
+        "tire_age", "tire_wear", "fuel_level", "last_lap_time",
+        "pit_stops", "_pit_count", "_last_pit_time", "strategy_pattern", "_strategy_code",
+        "behavioral_profile", "_behavioral_snapshot",
+        "_lap_hist", "_lap_head", "_lap_count", "_last_recorded_lap_time", "_recent_lap_sum",
+        "_positions", "_position_timestamps", "_position_head", "_position_count",
+        "tire_strategy_history",
+        "performance_baseline", "degradation_rate", "fuel_consumption_rate",
+        "pit_probability", "_threat_code", "last_update",
+        "_state_cache", "_state_dirty"
+    )
+    
+    def __init__(self, car_id: str, team: str, driver: str,
+                 on_pit: Optional[Callable[[str, Dict[str, Any]], None]] = None):
         """
         Initialize competitor model.
         
@@ -31,16 +576,20 @@ class CompetitorModel:
             car_id: Unique car identifier
             team: Team name
             driver: Driver name
+            on_pit: Optional callback invoked with (car_id, pit_stop) when a
+                pit stop is detected
         """
         self.car_id = car_id
         self.team = team
         self.driver = driver
+        self._on_pit = on_pit
         
         # Current state
         self.current_position = 0
         self.gap_to_leader = 0.0
         self.speed = 0.0
         self.tire_compound = "medium"
+        self._compound_code = int(Compound.MEDIUM)
         self.tire_age = 0
         self.tire_wear = 0.0
         self.fuel_level = 1.0
@@ -48,19 +597,26 @@ class CompetitorModel:
         
         # Pit history and strategy tracking
         self.pit_stops: List[Dict[str, Any]] = []
+        self._pit_count = 0
+        self._last_pit_time = 0.0  # Epoch seconds of the last pit stop, 0 if none
         self.strategy_pattern = "unknown"
-        self.predicted_strategy = "two_stop"
+        self._strategy_code = int(Strategy.TWO_STOP)
         
         # Behavioral profile
-        self.behavioral_profile = {
-            "undercut_tendency": 0.5,
-            "aggressive_defense": 0.5,
-            "tire_management": 0.5
-        }
-        
-        # Historical data for pattern analysis
-        self.lap_times_history = deque(maxlen=20)  # Last 20 laps
-        self.position_history = deque(maxlen=50)   # Last 50 position updates
+        self.behavioral_profile = BehavioralProfile()
+        # Dict form of the profile shared by state dicts until the profile changes
+        self._behavioral_snapshot: Optional[Dict[str, float]] = None
+        
+        # Historical data for pattern analysis, kept in ring buffers
+        self._lap_hist = np.zeros(LAP_HISTORY_SIZE, dtype=LAP_DTYPE)
+        self._lap_head = 0
+        self._lap_count = 0
+        self._last_recorded_lap_time = 0.0
+        self._recent_lap_sum = 0.0  # Sum of the last RECENT_LAP_WINDOW lap times
+        self._positions = np.zeros(POSITION_HISTORY_SIZE, dtype=np.int16)
+        self._position_timestamps = np.zeros(POSITION_HISTORY_SIZE, dtype=np.float64)
+        self._position_head = 0
+        self._position_count = 0
         self.tire_strategy_history: List[Dict[str, Any]] = []
         
         # Performance metrics
@@ -70,76 +626,125 @@ class CompetitorModel:
         
         # Strategic analysis
         self.pit_probability = 0.0
-        self.strategic_threat_level = "medium"
+        self._threat_code = int(Threat.MEDIUM)
         self.last_update = datetime.now(timezone.utc)
+        
+        # Cached get_state_dict result, rebuilt after the next state change
+        self._state_cache: Optional[Dict[str, Any]] = None
+        self._state_dirty = True
     
-    def update_state(self, telemetry_data: Dict[str, Any]) -> None:
+    def update_state(self, position: Optional[int] = None, speed: Optional[float] = None,
+                     lap_time: Optional[float] = None, tire_compound: Optional[str] = None,
+                     tire_age: Optional[int] = None, tire_wear: Optional[float] = None,
+                     fuel_level: Optional[float] = None, lap: int = 0,
+                     now: Optional[datetime] = None) -> None:
         """
-        Update competitor state from telemetry data.
+        Update competitor state from telemetry values.
+        
+        Values left as None keep the competitor's current value.
         
         Args:
-            telemetry_data: Telemetry data for this competitor
+            position: Race position
+            speed: Current speed
+            lap_time: Last lap time
+            tire_compound: Current tire compound
+            tire_age: Tire age in laps
+            tire_wear: Tire wear level
+            fuel_level: Fuel level (0.0 to 1.0)
+            lap: Current race lap
+            now: Timestamp of the current update cycle (defaults to current time)
         """
+        if now is None:
+            now = datetime.now(timezone.utc)
+        
+        self._state_dirty = True
+        
         # Update basic state
-        self.current_position = telemetry_data.get("position", self.current_position)
-        self.speed = telemetry_data.get("speed", self.speed)
-        self.last_lap_time = telemetry_data.get("lap_time", self.last_lap_time)
+        if position is not None:
+            self.current_position = position
+        if speed is not None:
+            self.speed = speed
+        if lap_time is not None:
+            self.last_lap_time = lap_time
         
         # Update tire information
-        tire_data = telemetry_data.get("tire", {})
-        self.tire_compound = tire_data.get("compound", self.tire_compound)
-        self.tire_age = tire_data.get("age", self.tire_age)
-        self.tire_wear = tire_data.get("wear_level", self.tire_wear)
+        if tire_compound is not None and tire_compound != self.tire_compound:
+            self.tire_compound = tire_compound
+            self._compound_code = _COMPOUND_IDS.get(tire_compound, int(Compound.UNKNOWN))
+        if tire_age is not None:
+            self.tire_age = tire_age
+        if tire_wear is not None:
+            self.tire_wear = tire_wear
         
         # Update fuel level
-        self.fuel_level = telemetry_data.get("fuel_level", self.fuel_level)
+        if fuel_level is not None:
+            self.fuel_level = fuel_level
         
         # Track historical data
-        if self.last_lap_time > 0:
-            self.lap_times_history.append({
-                "lap_time": self.last_lap_time,
-                "tire_age": self.tire_age,
-                "tire_compound": self.tire_compound,
-                "timestamp": datetime.now(timezone.utc)
-            })
+        timestamp = now.timestamp()
+        # Record each lap once, even when it is sampled on several updates
+        if self.last_lap_time > 0 and self.last_lap_time != self._last_recorded_lap_time:
+            self._last_recorded_lap_time = self.last_lap_time
+            head = self._lap_head
+            if self._lap_count >= RECENT_LAP_WINDOW:
+                oldest = (head - RECENT_LAP_WINDOW) % LAP_HISTORY_SIZE
+                self._recent_lap_sum -= float(self._lap_hist["lap_time"][oldest])
+            self._recent_lap_sum += self.last_lap_time
+            self._lap_hist[head] = (
+                self.last_lap_time, self.tire_age, self._compound_code, timestamp
+            )
+            self._lap_head = (head + 1) % LAP_HISTORY_SIZE
+            if self._lap_count < LAP_HISTORY_SIZE:
+                self._lap_count += 1
         
-        self.position_history.append({
-            "position": self.current_position,
-            "timestamp": datetime.now(timezone.utc)
-        })
+        head = self._position_head
+        self._positions[head] = self.current_position
+        self._position_timestamps[head] = timestamp
+        self._position_head = (head + 1) % POSITION_HISTORY_SIZE
+        if self._position_count < POSITION_HISTORY_SIZE:
+            self._position_count += 1
         
         # Detect pit stops
-        self._detect_pit_stop(telemetry_data)
+        self._detect_pit_stop(lap, position, tire_compound, tire_age, now)
         
         # Update behavioral analysis
         self._update_behavioral_profile()
         
-        self.last_update = datetime.now(timezone.utc)
+        self.last_update = now
     
-    def _detect_pit_stop(self, telemetry_data: Dict[str, Any]) -> None:
+    def _detect_pit_stop(self, lap: int, position: Optional[int],
+                         tire_compound: Optional[str], tire_age: Optional[int],
+                         now: datetime) -> None:
         """
         Detect if competitor has made a pit stop.
         
         Args:
-            telemetry_data: Current telemetry data
+            lap: Current race lap
+            position: Reported race position, if any
+            tire_compound: Reported tire compound, if any
+            tire_age: Reported tire age, if any
+            now: Timestamp of the current update cycle
         """
         # Check for tire age reset (indicates pit stop)
-        tire_data = telemetry_data.get("tire", {})
-        new_tire_age = tire_data.get("age", self.tire_age)
+        new_tire_age = tire_age if tire_age is not None else self.tire_age
         
         if new_tire_age < self.tire_age and self.tire_age > 5:
             # Pit stop detected
             pit_stop = {
-                "lap": telemetry_data.get("lap", 0),
-                "timestamp": datetime.now(timezone.utc),
+                "lap": lap,
+                "timestamp": now,
                 "old_tire_compound": self.tire_compound,
-                "new_tire_compound": tire_data.get("compound", "medium"),
+                "new_tire_compound": tire_compound if tire_compound is not None else "medium",
                 "old_tire_age": self.tire_age,
                 "position_before": self.current_position,
-                "position_after": telemetry_data.get("position", self.current_position)
+                "position_after": position if position is not None else self.current_position
             }
             
             self.pit_stops.append(pit_stop)
+            self._pit_count += 1
+            self._last_pit_time = now.timestamp()
+            if self._on_pit is not None:
+                self._on_pit(self.car_id, pit_stop)
             
             # Analyze pit stop strategy
             self._analyze_pit_strategy(pit_stop)
@@ -156,8 +761,9 @@ class CompetitorModel:
         
         if position_change < 0:  # Gained positions
             strategy_type = "undercut"
-            self.behavioral_profile["undercut_tendency"] = min(1.0, 
-                self.behavioral_profile["undercut_tendency"] + 0.1)
+            self.behavioral_profile.undercut_tendency = min(1.0, 
+                self.behavioral_profile.undercut_tendency + 0.1)
+            self._behavioral_snapshot = None
         elif position_change > 2:  # Lost significant positions
             strategy_type = "overcut"
         else:
@@ -171,7 +777,7 @@ class CompetitorModel:
         })
         
         # Update predicted strategy based on pit count
-        pit_count = len(self.pit_stops)
+        pit_count = self._pit_count
         if pit_count == 0:
             self.predicted_strategy = "two_stop"
         elif pit_count == 1:
@@ -186,35 +792,135 @@ class CompetitorModel:
         else:
             self.predicted_strategy = "unknown"
     
-    def _update_behavioral_profile(self) -> None:
-        """Update behavioral profile based on recent actions."""
-        if len(self.lap_times_history) < 5:
-            return
+    @property
+    def predicted_strategy(self) -> str:
+        """Predicted pit strategy name."""
+        return STRATEGY_NAMES[self._strategy_code]
+    
+    @predicted_strategy.setter
+    def predicted_strategy(self, strategy: str) -> None:
+        self._strategy_code = _STRATEGY_CODES.get(strategy, int(Strategy.UNKNOWN))
+    
+    @property
+    def strategy_code(self) -> int:
+        """Predicted pit strategy as a ``Strategy`` code."""
+        return self._strategy_code
+    
+    @property
+    def strategic_threat_level(self) -> str:
+        """Strategic threat level name."""
+        return THREAT_NAMES[self._threat_code]
+    
+    @strategic_threat_level.setter
+    def strategic_threat_level(self, threat: str) -> None:
+        self._threat_code = _THREAT_CODES.get(threat, int(Threat.MEDIUM))
+    
+    @property
+    def threat_code(self) -> int:
+        """Strategic threat level as a ``Threat`` code."""
+        return self._threat_code
+    
+    @property
+    def lap_history_count(self) -> int:
+        """Number of laps held in the lap time history."""
+        return self._lap_count
+    
+    @property
+    def position_history_count(self) -> int:
+        """Number of updates held in the position history."""
+        return self._position_count
+    
+    @property
+    def pit_stop_count(self) -> int:
+        """Number of pit stops detected."""
+        return self._pit_count
+    
+    @property
+    def last_pit_time(self) -> float:
+        """Epoch seconds of the last pit stop, 0.0 if none."""
+        return self._last_pit_time
+    
+    @property
+    def recent_avg(self) -> float:
+        """Average of the last RECENT_LAP_WINDOW recorded lap times (0.0 if none)."""
+        count = min(self._lap_count, RECENT_LAP_WINDOW)
+        return self._recent_lap_sum / count if count else 0.0
+    
+    def recent_lap_times(self, n: int) -> np.ndarray:
+        """
+        Get the most recent recorded lap times.
         
-        # Analyze tire management from lap time consistency
-        recent_times = [entry["lap_time"] for entry in list(self.lap_times_history)[-10:]]
-        if len(recent_times) >= 5:
-            time_variance = max(recent_times) - min(recent_times)
-            # Lower variance indicates better tire management
-            tire_mgmt_score = max(0.0, 1.0 - (time_variance / 5.0))
-            self.behavioral_profile["tire_management"] = (
-                self.behavioral_profile["tire_management"] * 0.8 + tire_mgmt_score * 0.2
-            )
+        Args:
+            n: Maximum number of lap times to return
+            
+        Returns:
+            Array of lap times, oldest first
+        """
+        return _ring_tail(self._lap_hist["lap_time"], self._lap_head, self._lap_count, n)
+    
+    def recent_positions(self, n: int) -> np.ndarray:
+        """
+        Get the most recent recorded positions.
         
-        # Analyze defensive behavior from position changes
-        if len(self.position_history) >= 10:
-            position_changes = []
-            positions = list(self.position_history)[-10:]
-            for i in range(1, len(positions)):
-                change = positions[i]["position"] - positions[i-1]["position"]
-                position_changes.append(abs(change))
+        Args:
+            n: Maximum number of positions to return
             
-            avg_position_change = sum(position_changes) / len(position_changes)
-            # Higher position volatility suggests more aggressive racing
-            aggression_score = min(1.0, avg_position_change / 2.0)
-            self.behavioral_profile["aggressive_defense"] = (
-                self.behavioral_profile["aggressive_defense"] * 0.9 + aggression_score * 0.1
+        Returns:
+            Array of positions, oldest first
+        """
+        return _ring_tail(self._positions, self._position_head, self._position_count, n)
+    
+    @property
+    def lap_times_history(self) -> List[Dict[str, Any]]:
+        """Lap time history as a list of entries, oldest first."""
+        entries = _ring_tail(self._lap_hist, self._lap_head, self._lap_count, self._lap_count)
+        return [
+            {
+                "lap_time": lap_time,
+                "tire_age": tire_age,
+                "tire_compound": TIRE_COMPOUNDS[compound],
+                "timestamp": datetime.fromtimestamp(timestamp, timezone.utc)
+            }
+            for lap_time, tire_age, compound, timestamp in entries.tolist()
+        ]
+    
+    @property
+    def position_history(self) -> List[Dict[str, Any]]:
+        """Position history as a list of entries, oldest first."""
+        count = self._position_count
+        head = self._position_head
+        return [
+            {
+                "position": int(position),
+                "timestamp": datetime.fromtimestamp(timestamp, timezone.utc)
+            }
+            for position, timestamp in zip(
+                _ring_tail(self._positions, head, count, count),
+                _ring_tail(self._position_timestamps, head, count, count)
             )
+        ]
+    
+    def _update_behavioral_profile(self) -> None:
+        """Update behavioral profile based on recent actions."""
+        if self._lap_count < 5:
+            return
+        
+        # Analyze tire management from lap time consistency and defensive
+        # behavior from position changes
+        profile = self.behavioral_profile
+        tire_management, aggressive_defense = _behavioral_update(
+            self.recent_lap_times(10),
+            self.recent_positions(10),
+            profile.tire_management,
+            profile.aggressive_defense
+        )
+        tire_management = float(tire_management)
+        aggressive_defense = float(aggressive_defense)
+        if (tire_management != profile.tire_management or
+                aggressive_defense != profile.aggressive_defense):
+            profile.tire_management = tire_management
+            profile.aggressive_defense = aggressive_defense
+            self._behavioral_snapshot = None
     
     def calculate_pit_probability(self, current_lap: int, total_laps: int) -> float:
         """
@@ -227,33 +933,18 @@ class CompetitorModel:
         Returns:
             Pit probability (0.0 to 1.0)
         """
-        # Base probability on tire age and wear
-        tire_factor = min(1.0, (self.tire_age / 25.0) + (self.tire_wear * 0.5))
-        
-        # Strategy-based probability
-        strategy_factor = 0.0
-        if self.predicted_strategy == "two_stop" and len(self.pit_stops) == 0:
-            # First pit window for two-stop
-            if 15 <= current_lap <= 25:
-                strategy_factor = 0.7
-            elif 26 <= current_lap <= 35:
-                strategy_factor = 0.4
-        elif self.predicted_strategy == "two_stop" and len(self.pit_stops) == 1:
-            # Second pit window for two-stop
-            if 35 <= current_lap <= 45:
-                strategy_factor = 0.8
-        elif self.predicted_strategy == "one_stop" and len(self.pit_stops) == 0:
-            # Single pit window
-            if 25 <= current_lap <= 40:
-                strategy_factor = 0.6
-        
-        # Fuel factor
-        fuel_factor = max(0.0, 1.0 - (self.fuel_level / 0.3))  # High probability if fuel < 30%
-        
-        # Combine factors
-        probability = min(1.0, tire_factor * 0.4 + strategy_factor * 0.4 + fuel_factor * 0.2)
+        table = build_strategy_factor_table(total_laps)
+        strategy_factor = table[
+            self._strategy_code,
+            min(self._pit_count, STRATEGY_FACTOR_MAX_PITS),
+            min(max(current_lap, 0), table.shape[2] - 1)
+        ]
+        probability = float(_pit_probability(
+            self.tire_age, self.tire_wear, self.fuel_level, strategy_factor
+        ))
         
         self.pit_probability = probability
+        self._state_dirty = True
         return probability
     
     def assess_strategic_threat(self, our_position: int, our_gap: float) -> str:
@@ -267,42 +958,46 @@ class CompetitorModel:
         Returns:
             Threat level: "low", "medium", "high", "critical"
         """
-        # Position-based threat
-        position_diff = abs(self.current_position - our_position)
-        
-        if position_diff > 3:
-            threat = "low"
-        elif position_diff > 1:
-            threat = "medium"
-        else:
-            # Close positions - analyze gap and strategy
-            if abs(our_gap) < 5.0:  # Within 5 seconds
-                if self.pit_probability > 0.6:
-                    threat = "high"  # Likely to pit and affect our strategy
-                elif self.behavioral_profile["undercut_tendency"] > 0.7:
-                    threat = "high"  # Aggressive strategic behavior
-                else:
-                    threat = "medium"
-            elif abs(our_gap) < 15.0:  # Within pit window
-                threat = "medium"
-            else:
-                threat = "low"
-        
-        # Upgrade threat if competitor is on fresher tires
-        if self.tire_age < 5 and threat in ["low", "medium"]:
-            threat = "medium" if threat == "low" else "high"
+        threat = _threat_level(
+            abs(self.current_position - our_position), abs(our_gap),
+            self.pit_probability, self.behavioral_profile.undercut_tendency,
+            self.tire_age
+        )
+        
+        self._threat_code = int(threat)
+        self._state_dirty = True
+        return THREAT_NAMES[threat]
+    
+    def _apply_assessment(self, pit_probability: float, threat_code: int) -> None:
+        """
+        Store a pit probability and threat level computed in a batch.
         
-        self.strategic_threat_level = threat
-        return threat
+        Args:
+            pit_probability: Pit probability (0.0 to 1.0)
+            threat_code: ``Threat`` code
+        """
+        self.pit_probability = pit_probability
+        self._threat_code = threat_code
+        self._state_dirty = True
     
     def get_state_dict(self) -> Dict[str, Any]:
         """
         Get competitor state as dictionary.
         
+        The dictionary is cached until the next update_state,
+        calculate_pit_probability or assess_strategic_threat call, so callers
+        must treat it as read-only.
+        
         Returns:
             Competitor state dictionary
         """
-        return {
+        if not self._state_dirty and self._state_cache is not None:
+            return self._state_cache
+        
+        if self._behavioral_snapshot is None:
+            self._behavioral_snapshot = self.behavioral_profile.to_dict()
+        
+        self._state_cache = {
             "car_id": self.car_id,
             "team": self.team,
             "driver": self.driver,
@@ -311,7 +1006,7 @@ class CompetitorModel:
             "predicted_strategy": self.predicted_strategy,
             "pit_probability": self.pit_probability,
             "strategic_threat_level": self.strategic_threat_level,
-            "behavioral_profile": self.behavioral_profile.copy(),
+            "behavioral_profile": self._behavioral_snapshot,
             "current_state": {
                 "speed": self.speed,
                 "tire_compound": self.tire_compound,
@@ -320,13 +1015,192 @@ class CompetitorModel:
                 "fuel_level": self.fuel_level,
                 "last_lap_time": self.last_lap_time
             },
-            "pit_stops_count": len(self.pit_stops),
+            "pit_stops_count": self._pit_count,
             "performance_metrics": {
                 "degradation_rate": self.degradation_rate,
                 "fuel_consumption_rate": self.fuel_consumption_rate,
                 "performance_baseline": self.performance_baseline
             }
         }
+        self._state_dirty = False
+        return self._state_cache
+
+
+def _empty_column(dtype: Any) -> np.ndarray:
+    """Create an empty CompetitorTable column."""
+    return np.zeros(0, dtype=dtype)
+
+
+@dataclass
+class CompetitorTable:
+    """
+    Structure-of-arrays view of competitor state, one row per competitor.
+    
+    Rows are appended in the order competitors are first seen, matching the
+    iteration order of ``FieldTwin.competitors``.
+    """
+    car_ids: List[str] = field(default_factory=list)
+    rows: Dict[str, int] = field(default_factory=dict)
+    pit_prob: np.ndarray = field(default_factory=lambda: _empty_column(np.float64))
+    tire_age: np.ndarray = field(default_factory=lambda: _empty_column(np.int16))
+    gap: np.ndarray = field(default_factory=lambda: _empty_column(np.float64))
+    pos: np.ndarray = field(default_factory=lambda: _empty_column(np.int16))
+    threat_code: np.ndarray = field(default_factory=lambda: _empty_column(np.uint8))
+    undercut_tend: np.ndarray = field(default_factory=lambda: _empty_column(np.float64))
+    aggr_def: np.ndarray = field(default_factory=lambda: _empty_column(np.float64))
+    tire_mgmt: np.ndarray = field(default_factory=lambda: _empty_column(np.float64))
+    last_lap_time: np.ndarray = field(default_factory=lambda: _empty_column(np.float64))
+    degradation_rate: np.ndarray = field(default_factory=lambda: _empty_column(np.float64))
+    fuel_rate: np.ndarray = field(default_factory=lambda: _empty_column(np.float64))
+    fuel_level: np.ndarray = field(default_factory=lambda: _empty_column(np.float64))
+    lap_count: np.ndarray = field(default_factory=lambda: _empty_column(np.int16))
+    position_count: np.ndarray = field(default_factory=lambda: _empty_column(np.int16))
+    pit_count: np.ndarray = field(default_factory=lambda: _empty_column(np.int16))
+    last_pit_time: np.ndarray = field(default_factory=lambda: _empty_column(np.float64))
+    
+    def add(self, car_id: str) -> int:
+        """
+        Append a row for a new competitor.
+        
+        Args:
+            car_id: Competitor car ID
+            
+        Returns:
+            Row index of the competitor
+        """
+        row = len(self.car_ids)
+        self.rows[car_id] = row
+        self.car_ids.append(car_id)
+        self.pit_prob = np.append(self.pit_prob, 0.0)
+        self.tire_age = np.append(self.tire_age, np.int16(0))
+        self.gap = np.append(self.gap, 0.0)
+        self.pos = np.append(self.pos, np.int16(0))
+        self.threat_code = np.append(self.threat_code, np.uint8(Threat.MEDIUM))
+        self.undercut_tend = np.append(self.undercut_tend, 0.5)
+        self.aggr_def = np.append(self.aggr_def, 0.5)
+        self.tire_mgmt = np.append(self.tire_mgmt, 0.5)
+        self.last_lap_time = np.append(self.last_lap_time, 0.0)
+        self.degradation_rate = np.append(self.degradation_rate, 0.0)
+        self.fuel_rate = np.append(self.fuel_rate, 0.0)
+        self.fuel_level = np.append(self.fuel_level, 1.0)
+        self.lap_count = np.append(self.lap_count, np.int16(0))
+        self.position_count = np.append(self.position_count, np.int16(0))
+        self.pit_count = np.append(self.pit_count, np.int16(0))
+        self.last_pit_time = np.append(self.last_pit_time, 0.0)
+        return row
+    
+    def write_state(self, row: int, competitor: CompetitorModel) -> None:
+        """
+        Copy a competitor's race and stint state and behavioral profile into its row.
+        
+        Args:
+            row: Row index of the competitor
+            competitor: Competitor model
+        """
+        profile = competitor.behavioral_profile
+        self.tire_age[row] = competitor.tire_age
+        self.gap[row] = competitor.gap_to_leader
+        self.pos[row] = competitor.current_position
+        self.undercut_tend[row] = profile.undercut_tendency
+        self.aggr_def[row] = profile.aggressive_defense
+        self.tire_mgmt[row] = profile.tire_management
+        self.last_lap_time[row] = competitor.last_lap_time
+        self.degradation_rate[row] = competitor.degradation_rate
+        self.fuel_rate[row] = competitor.fuel_consumption_rate
+        self.fuel_level[row] = competitor.fuel_level
+        self.lap_count[row] = competitor.lap_history_count
+        self.position_count[row] = competitor.position_history_count
+        self.pit_count[row] = competitor.pit_stop_count
+        self.last_pit_time[row] = competitor.last_pit_time
+    
+    def write_assessment(self, rows: np.ndarray, pit_probs: np.ndarray,
+                         threat_codes: np.ndarray) -> None:
+        """
+        Store batch pit probability and threat results.
+        
+        Args:
+            rows: Row indices of the assessed competitors
+            pit_probs: Pit probability per row
+            threat_codes: Threat code per row
+        """
+        self.pit_prob[rows] = pit_probs
+        self.threat_code[rows] = threat_codes
+
+
+@dataclass(slots=True)
+class Opportunity:
+    """A strategic opportunity tracked by the Field Twin."""
+    type: str
+    target_car: str
+    probability: float
+    execution_lap: int
+    reasoning: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get opportunity as a dictionary.
+        
+        Returns:
+            Opportunity data dictionary
+        """
+        return {
+            "type": self.type,
+            "target_car": self.target_car,
+            "probability": self.probability,
+            "execution_lap": self.execution_lap,
+            "reasoning": self.reasoning
+        }
+
+
+_kernels_warm = False
+
+
+def warm_up_kernels() -> None:
+    """
+    Compile the JIT kernels, or load them from the cache, before the first update.
+    
+    Numba compiles a kernel on its first call for each argument type
+    signature, which on a cold cache takes seconds inside update_state. Each
+    kernel is called once here with tiny inputs of the types and array
+    layouts the Field Twin passes it. Runs once per process and does nothing
+    when numba is not installed.
+    """
+    global _kernels_warm
+    if _kernels_warm or not NUMBA_AVAILABLE:
+        return
+    
+    table = CompetitorTable()
+    rows = np.array([table.add("warm_up")], dtype=np.intp)
+    strategy_factor_table = build_strategy_factor_table(50)
+    
+    # Recent lap times are a strided field view, or a copy once the ring wraps
+    laps = np.zeros(2, dtype=LAP_DTYPE)
+    positions = np.zeros(2, dtype=np.int16)
+    _behavioral_update(laps["lap_time"], positions, 0.5, 0.5)
+    _behavioral_update(laps["lap_time"].copy(), positions, 0.5, 0.5)
+    
+    _pit_probability(0, 0.0, 1.0, strategy_factor_table[0, 0, 0])
+    _threat_level(0, 0.0, 0.0, 0.5, 0)
+    _batch_pit_and_threat(
+        np.zeros(1), np.zeros(1), np.ones(1), np.zeros(1, dtype=np.int64),
+        table.pit_count[rows].astype(np.int64), table.pos[rows].astype(np.int64),
+        table.gap[rows], table.undercut_tend[rows], strategy_factor_table, 0, 1, 0.0,
+        np.empty(1), np.empty(1, dtype=np.int64)
+    )
+    
+    lap_offsets = np.arange(1, 3)
+    _pit_window_kernel(lap_offsets, 0, 0, 0.0, 1.0, 0.0, 0, 0, build_pit_window_factor_table(50))
+    evolution = np.empty((1, lap_offsets.shape[0]), dtype=LAP_PREDICTION_DTYPE)
+    _predict_field(
+        lap_offsets, 0, table.tire_age, table.last_lap_time, table.degradation_rate,
+        table.fuel_rate, table.fuel_level, table.lap_count, table.position_count,
+        table.pit_count, table.tire_mgmt, evolution["degradation_impact"],
+        evolution["predicted_lap_time"], np.empty(1, dtype=np.int64), np.empty(1), np.empty(1)
+    )
+    
+    _strategic_value_core(1, 0, 0.5)
+    _isolation_risk_core(0, 1, 1)
+    _kernels_warm = True
 
 
 class FieldTwin(BaseTwinModel):
@@ -345,27 +1219,65 @@ class FieldTwin(BaseTwinModel):
         """
         super().__init__(twin_id, "field_twin")
         
+        # Compile the numeric kernels now rather than in the first updates
+        warm_up_kernels()
+        
         # Competitor models
         self.competitors: Dict[str, CompetitorModel] = {}
+        # Competitor models in tracking order, extended when a new car appears
+        self._competitor_list: List[CompetitorModel] = []
+        
+        # Per-competitor columns indexed in the same order as self.competitors
+        self._competitor_table = CompetitorTable()
+        
+        # Competitors grouped by position, rebuilt on demand after updates
+        self._position_index: Optional[Dict[int, List[CompetitorModel]]] = None
+        
+        # Competitor counts per predicted strategy code, rebuilt on demand after updates
+        self._strategy_counts: Optional[Counter] = None
         
         # Race context
         self.current_lap = 0
         self.total_laps = 50  # Default, updated from telemetry
+        
+        # Strategy pit factor table for the current race distance
+        self._strategy_factor_table = build_strategy_factor_table(self.total_laps)
+        self._pit_window_factor_table = build_pit_window_factor_table(self.total_laps)
+        self._cached_total_laps = self.total_laps
         self.session_type = "race"
         self.track_status = "green"
         
         # Strategic analysis
-        self.strategic_opportunities: List[Dict[str, Any]] = []
-        self.race_events: List[Dict[str, Any]] = []
+        # Dict snapshots handed out by the getters, rebuilt after changes
+        self._opportunity_snapshot: Optional[List[Dict[str, Any]]] = None
+        self._race_event_snapshot: Optional[List[Dict[str, Any]]] = None
+        self.strategic_opportunities: List[Opportunity] = []
+        self._earliest_opportunity_lap: Optional[int] = None
+        self.race_events: deque = deque(maxlen=RACE_EVENT_HISTORY_SIZE)
+        self._recent_events: deque = deque(maxlen=RECENT_EVENTS_SIZE)
+        self._recent_event_window: deque = deque()  # Events newer than event_opportunity_window
+        self._unseen_pits: deque = deque()  # (car_id, pit_stop) awaiting event detection
         
         # Our car reference (for strategic analysis)
         self.our_car_id = get_config("car.our_car_id", "44")
         self.our_position = 1
         self.our_gap_to_leader = 0.0
         
+        # Per-competitor results shared within one _generate_predictions call
+        self._pred_cache: Optional[Dict[str, Dict[str, Any]]] = None
+        
         # Performance tracking
         self.last_opportunity_scan = datetime.now(timezone.utc)
         self.opportunity_scan_interval = timedelta(seconds=15)  # Scan every 15 seconds
+        self.event_opportunity_window = timedelta(seconds=60)  # Events considered recent
+        
+        # Bumped whenever a telemetry update starts changing the field state
+        self._state_version = 0
+    
+    @property
+    def state_version(self) -> int:
+        """Counter that changes whenever the field state may have changed."""
+        return self._state_version
     
     def _update_internal_state(self, telemetry_data: Dict[str, Any]) -> None:
         """
@@ -374,90 +1286,168 @@ class FieldTwin(BaseTwinModel):
         Args:
             telemetry_data: Normalized telemetry data
         """
+        self._state_version += 1
+        now = datetime.now(timezone.utc)
+        
         # Update internal state dictionary for base class
         self._state.update({
             "telemetry_data": telemetry_data,
-            "last_update": datetime.now(timezone.utc).isoformat()
+            "last_update": now.isoformat()
         })
         
         # Update race context
         self.current_lap = telemetry_data.get("lap", self.current_lap)
+        self.total_laps = telemetry_data.get("total_laps") or self.total_laps
         self.session_type = telemetry_data.get("session_type", self.session_type)
         
         track_conditions = telemetry_data.get("track_conditions", {})
         self.track_status = track_conditions.get("track_status", self.track_status)
         
+        # Rebake the strategy pit windows when the race distance changes
+        if self.total_laps != self._cached_total_laps:
+            self._strategy_factor_table = build_strategy_factor_table(self.total_laps)
+            self._pit_window_factor_table = build_pit_window_factor_table(self.total_laps)
+            self._cached_total_laps = self.total_laps
+        
         # Process car data
         cars_data = telemetry_data.get("cars", [])
         
-        # Find our car and update reference
+        # Find our car and the leader in a single pass
+        our_car_id = self.our_car_id
+        our_car = None
+        leader = None
+        competitor_cars = []
         for car_data in cars_data:
             car_id = car_data.get("car_id")
-            if car_id == self.our_car_id:
-                self.our_position = car_data.get("position", self.our_position)
-                # Calculate gap to leader
-                leader_cars = [car for car in cars_data if car.get("position") == 1]
-                if leader_cars:
-                    leader_time = leader_cars[0].get("lap_time", 0)
-                    our_time = car_data.get("lap_time", leader_time)
-                    self.our_gap_to_leader = our_time - leader_time
-                else:
-                    self.our_gap_to_leader = 0.0
-        
-        # Update competitor models
-        for car_data in cars_data:
-            car_id = car_data.get("car_id")
-            if car_id and car_id != self.our_car_id:
-                self._update_competitor(car_data)
+            if leader is None and car_data.get("position") == 1:
+                leader = car_data
+            if car_id == our_car_id:
+                our_car = car_data
+            elif car_id:
+                competitor_cars.append(car_data)
+        
+        # Update our car reference before competitors are assessed against it
+        if our_car is not None:
+            self.our_position = our_car.get("position", self.our_position)
+            # Calculate gap to leader
+            if leader is not None:
+                leader_time = leader.get("lap_time", 0)
+                our_time = our_car.get("lap_time", leader_time)
+                self.our_gap_to_leader = our_time - leader_time
+            else:
+                self.our_gap_to_leader = 0.0
+        
+        # Update competitor models, then assess them in one batch
+        updated = [self._update_competitor(car_data, now) for car_data in competitor_cars]
+        if updated:
+            self._assess_competitors(updated)
         
         # Detect race events
-        self._detect_race_events(telemetry_data)
+        self._detect_race_events(telemetry_data, now)
         
         # Update strategic opportunities
-        if (datetime.now(timezone.utc) - self.last_opportunity_scan) > self.opportunity_scan_interval:
+        if (now - self.last_opportunity_scan) > self.opportunity_scan_interval:
             self._scan_strategic_opportunities()
-            self.last_opportunity_scan = datetime.now(timezone.utc)
+            self.last_opportunity_scan = now
     
-    def _update_competitor(self, car_data: Dict[str, Any]) -> None:
+    def _update_competitor(self, car_data: Dict[str, Any], now: datetime) -> CompetitorModel:
         """
         Update or create competitor model.
         
+        Pit probability and threat level are assessed separately by
+        _assess_competitors once all competitors are updated.
+        
         Args:
             car_data: Telemetry data for a competitor car
+            now: Timestamp of the current update cycle
+            
+        Returns:
+            The updated competitor model
         """
         car_id = car_data.get("car_id")
         
         # Create competitor model if it doesn't exist
         if car_id not in self.competitors:
-            self.competitors[car_id] = CompetitorModel(
+            new_competitor = CompetitorModel(
                 car_id=car_id,
                 team=car_data.get("team", "Unknown"),
-                driver=car_data.get("driver", "Unknown")
+                driver=car_data.get("driver", "Unknown"),
+                on_pit=self._on_competitor_pit
             )
+            self.competitors[car_id] = new_competitor
+            self._competitor_list.append(new_competitor)
+            self._competitor_table.add(car_id)
         
-        # Update competitor state
+        # Update competitor state, extracting each telemetry field once
         competitor = self.competitors[car_id]
-        competitor.update_state(car_data)
+        position = car_data.get("position")
+        tire_data = car_data.get("tire") or _EMPTY_DICT
+        competitor.update_state(
+            position=position,
+            speed=car_data.get("speed"),
+            lap_time=car_data.get("lap_time"),
+            tire_compound=tire_data.get("compound"),
+            tire_age=tire_data.get("age"),
+            tire_wear=tire_data.get("wear_level"),
+            fuel_level=car_data.get("fuel_level"),
+            lap=car_data.get("lap", 0),
+            now=now
+        )
         
         # Calculate gap to leader
-        if car_data.get("position") == 1:
+        if position == 1:
             competitor.gap_to_leader = 0.0
         else:
             # Simplified gap calculation - in reality would use timing data
-            position_diff = car_data.get("position", 1) - 1
+            position_diff = (position if position is not None else 1) - 1
             competitor.gap_to_leader = position_diff * 1.5  # Rough estimate
         
-        # Update pit probability and threat assessment
-        competitor.calculate_pit_probability(self.current_lap, self.total_laps)
-        competitor.assess_strategic_threat(self.our_position, 
-                                         competitor.gap_to_leader - self.our_gap_to_leader)
+        table = self._competitor_table
+        table.write_state(table.rows[car_id], competitor)
+        self._position_index = None
+        self._strategy_counts = None
+        return competitor
+    
+    def _assess_competitors(self, competitors: List[CompetitorModel]) -> None:
+        """
+        Update pit probability and threat assessment for a batch of competitors.
+        
+        Args:
+            competitors: Competitor models updated in this cycle
+        """
+        n = len(competitors)
+        table = self._competitor_table
+        rows = np.fromiter((table.rows[c.car_id] for c in competitors), dtype=np.intp, count=n)
+        out_probs = np.empty(n, dtype=np.float64)
+        out_threats = np.empty(n, dtype=np.int64)
+        # Position, gap and profile columns were just written by _update_competitor
+        _batch_pit_and_threat(
+            np.array([c.tire_age for c in competitors], dtype=np.float64),
+            np.array([c.tire_wear for c in competitors], dtype=np.float64),
+            np.array([c.fuel_level for c in competitors], dtype=np.float64),
+            np.array([c.strategy_code for c in competitors], dtype=np.int64),
+            table.pit_count[rows].astype(np.int64),
+            table.pos[rows].astype(np.int64),
+            table.gap[rows],
+            table.undercut_tend[rows],
+            self._strategy_factor_table, self.current_lap,
+            self.our_position, self.our_gap_to_leader,
+            out_probs, out_threats
+        )
+        
+        for competitor, probability, threat in zip(competitors, out_probs.tolist(),
+                                                   out_threats.tolist()):
+            competitor._apply_assessment(probability, threat)
+        
+        table.write_assessment(rows, out_probs, out_threats)
     
-    def _detect_race_events(self, telemetry_data: Dict[str, Any]) -> None:
+    def _detect_race_events(self, telemetry_data: Dict[str, Any], now: datetime) -> None:
         """
         Detect significant race events that affect strategy.
         
         Args:
             telemetry_data: Current telemetry data
+            now: Timestamp of the current update cycle
         """
         track_conditions = telemetry_data.get("track_conditions", {})
         current_status = track_conditions.get("track_status", "green")
@@ -466,51 +1456,89 @@ class FieldTwin(BaseTwinModel):
         if current_status != self.track_status:
             event = {
                 "type": "track_status_change",
-                "timestamp": datetime.now(timezone.utc),
+                "timestamp": now,
                 "lap": self.current_lap,
                 "old_status": self.track_status,
                 "new_status": current_status
             }
-            self.race_events.append(event)
+            self._record_event(event)
             
             # Safety car events trigger re-simulation
             if current_status in ["safety_car", "virtual_safety_car"]:
-                self._trigger_resimulation("safety_car", event)
-        
-        # Detect pit stops (already handled in competitor models)
-        for competitor in self.competitors.values():
-            if len(competitor.pit_stops) > 0:
-                last_pit = competitor.pit_stops[-1]
-                # Check if this is a new pit stop (within last update cycle)
-                if (datetime.now(timezone.utc) - last_pit["timestamp"]).seconds < 10:
-                    event = {
-                        "type": "competitor_pit_stop",
-                        "timestamp": last_pit["timestamp"],
-                        "lap": last_pit["lap"],
-                        "car_id": competitor.car_id,
-                        "pit_data": last_pit
-                    }
-                    self.race_events.append(event)
-                    self._trigger_resimulation("pit_stop", event)
+                self._trigger_resimulation("safety_car", event, now)
+        
+        # Report pit stops detected by the competitor models since the last cycle
+        unseen_pits = self._unseen_pits
+        while unseen_pits:
+            car_id, pit_stop = unseen_pits.popleft()
+            event = {
+                "type": "competitor_pit_stop",
+                "timestamp": pit_stop["timestamp"],
+                "lap": pit_stop["lap"],
+                "car_id": car_id,
+                "pit_data": pit_stop
+            }
+            self._record_event(event)
+            self._trigger_resimulation("pit_stop", event, now)
+    
+    def _record_event(self, event: Dict[str, Any]) -> None:
+        """
+        Append a race event to the event log and the recent event buffers.
+        
+        Events that fell out of the recent event window by the new event's
+        timestamp are expired, so the window stays bounded.
+        
+        Args:
+            event: Race event data
+        """
+        self.race_events.append(event)
+        self._race_event_snapshot = None
+        self._recent_events.append(event)
+        self._recent_event_window.append(event)
+        self._expire_recent_events(event["timestamp"])
+    
+    def _expire_recent_events(self, now: datetime) -> None:
+        """
+        Drop events older than event_opportunity_window from the recent event window.
+        
+        Args:
+            now: Time the window ends at
+        """
+        recent_events = self._recent_event_window
+        cutoff = now - self.event_opportunity_window
+        while recent_events and recent_events[0]["timestamp"] <= cutoff:
+            recent_events.popleft()
+    
+    def _on_competitor_pit(self, car_id: str, pit_stop: Dict[str, Any]) -> None:
+        """
+        Queue a competitor pit stop for the next race event detection pass.
+        
+        Args:
+            car_id: Competitor car ID
+            pit_stop: Pit stop data
+        """
+        self._unseen_pits.append((car_id, pit_stop))
     
-    def _trigger_resimulation(self, event_type: str, event_data: Dict[str, Any]) -> None:
+    def _trigger_resimulation(self, event_type: str, event_data: Dict[str, Any],
+                              now: datetime) -> None:
         """
         Trigger re-simulation for significant race events.
         
         Args:
             event_type: Type of event that triggered re-simulation
             event_data: Event data
+            now: Timestamp of the current update cycle
         """
         # Log the re-simulation trigger
         resim_event = {
             "type": "resimulation_triggered",
-            "timestamp": datetime.now(timezone.utc),
+            "timestamp": now,
             "trigger_event": event_type,
             "event_data": event_data,
             "lap": self.current_lap,
             "strategic_impact": self._assess_event_strategic_impact(event_type, event_data)
         }
-        self.race_events.append(resim_event)
+        self._record_event(resim_event)
         
         # Update strategic opportunities based on the event
         self._update_opportunities_for_event(event_type, event_data)
@@ -537,9 +1565,9 @@ class FieldTwin(BaseTwinModel):
             car_id = event_data.get("car_id")
             if car_id in self.competitors:
                 competitor = self.competitors[car_id]
-                if competitor.strategic_threat_level in ["high", "critical"]:
+                if competitor.threat_code >= Threat.HIGH:
                     return "high"
-                elif competitor.strategic_threat_level == "medium":
+                elif competitor.threat_code == Threat.MEDIUM:
                     return "medium"
             return "low"
         
@@ -563,14 +1591,14 @@ class FieldTwin(BaseTwinModel):
         """
         if event_type == "safety_car":
             # Safety car creates pit window opportunities
-            safety_car_opportunity = {
-                "type": "safety_car_opportunity",
-                "target_car": "field",
-                "probability": 0.9,
-                "execution_lap": self.current_lap,
-                "reasoning": "Safety car pit window - free pit stop opportunity"
-            }
-            self.strategic_opportunities.insert(0, safety_car_opportunity)
+            safety_car_opportunity = Opportunity(
+                type="safety_car_opportunity",
+                target_car="field",
+                probability=0.9,
+                execution_lap=self.current_lap,
+                reasoning="Safety car pit window - free pit stop opportunity"
+            )
+            self._add_event_opportunity(safety_car_opportunity)
         
         elif event_type == "pit_stop":
             car_id = event_data.get("car_id")
@@ -578,22 +1606,47 @@ class FieldTwin(BaseTwinModel):
                 competitor = self.competitors[car_id]
                 
                 # Create undercut response opportunity
-                if competitor.strategic_threat_level in ["medium", "high", "critical"]:
-                    response_opportunity = {
-                        "type": "pit_response",
-                        "target_car": car_id,
-                        "probability": 0.7,
-                        "execution_lap": self.current_lap + 1,
-                        "reasoning": f"Response to {car_id} pit stop - maintain track position"
-                    }
-                    self.strategic_opportunities.insert(0, response_opportunity)
-        
-        # Remove outdated opportunities
+                if competitor.threat_code >= Threat.MEDIUM:
+                    response_opportunity = Opportunity(
+                        type="pit_response",
+                        target_car=car_id,
+                        probability=0.7,
+                        execution_lap=self.current_lap + 1,
+                        reasoning=f"Response to {car_id} pit stop - maintain track position"
+                    )
+                    self._add_event_opportunity(response_opportunity)
+        
+        # Remove outdated opportunities, only rebuilding the list once the
+        # race has passed the earliest execution lap
         current_lap = self.current_lap
-        self.strategic_opportunities = [
-            opp for opp in self.strategic_opportunities
-            if opp["execution_lap"] >= current_lap
-        ]
+        if (self._earliest_opportunity_lap is not None and
+                self._earliest_opportunity_lap < current_lap):
+            self.strategic_opportunities = [
+                opp for opp in self.strategic_opportunities
+                if opp.execution_lap >= current_lap
+            ]
+            self._reset_earliest_opportunity_lap()
+    
+    def _add_event_opportunity(self, opportunity: Opportunity) -> None:
+        """
+        Add an event-driven opportunity ahead of existing opportunities.
+        
+        Args:
+            opportunity: Strategic opportunity data
+        """
+        # Build a new list so state snapshots already handed out stay unchanged
+        self.strategic_opportunities = [opportunity] + self.strategic_opportunities
+        
+        execution_lap = opportunity.execution_lap
+        if self._earliest_opportunity_lap is None or execution_lap < self._earliest_opportunity_lap:
+            self._earliest_opportunity_lap = execution_lap
+    
+    def _reset_earliest_opportunity_lap(self) -> None:
+        """Recompute the earliest execution lap across current opportunities."""
+        self._earliest_opportunity_lap = min(
+            (opp.execution_lap for opp in self.strategic_opportunities),
+            default=None
+        )
     
     def handle_safety_car_deployment(self) -> Dict[str, Any]:
         """
@@ -611,14 +1664,10 @@ class FieldTwin(BaseTwinModel):
         }
         
         # Analyze pit window implications
-        competitors_on_old_tires = []
-        competitors_on_fresh_tires = []
-        
-        for competitor in self.competitors.values():
-            if competitor.tire_age > 15:
-                competitors_on_old_tires.append(competitor.car_id)
-            elif competitor.tire_age < 5:
-                competitors_on_fresh_tires.append(competitor.car_id)
+        car_ids = self._competitor_table.car_ids
+        tire_ages = self._competitor_table.tire_age
+        competitors_on_old_tires = [car_ids[i] for i in np.flatnonzero(tire_ages > 15)]
+        competitors_on_fresh_tires = [car_ids[i] for i in np.flatnonzero(tire_ages < 5)]
         
         analysis["pit_window_analysis"] = {
             "free_pit_stop_available": True,
@@ -692,7 +1741,7 @@ class FieldTwin(BaseTwinModel):
             analysis["threat_level_change"] = "decreased"
         
         # Generate response options
-        if competitor.strategic_threat_level in ["medium", "high", "critical"]:
+        if competitor.threat_code >= Threat.MEDIUM:
             if analysis["strategic_type"] == "early_aggressive":
                 analysis["response_options"] = [
                     "Immediate counter-pit to cover undercut",
@@ -717,10 +1766,11 @@ class FieldTwin(BaseTwinModel):
         """
         opportunities = []
         
-        # Analyze recent events for opportunities
-        recent_events = [event for event in self.race_events 
-                        if (datetime.now(timezone.utc) - event["timestamp"]).seconds < 60]
+        # Expire events that fell out of the window; the rest are all recent
+        self._expire_recent_events(datetime.now(timezone.utc))
+        recent_events = self._recent_event_window
         
+        # Analyze recent events for opportunities
         for event in recent_events:
             if event["type"] == "competitor_pit_stop":
                 car_id = event["event_data"].get("car_id")
@@ -754,51 +1804,73 @@ class FieldTwin(BaseTwinModel):
     
     def _scan_strategic_opportunities(self) -> None:
         """Scan for strategic opportunities based on current competitor states."""
-        self.strategic_opportunities = []
-        
-        for competitor in self.competitors.values():
-            # Check for undercut opportunities
-            if competitor.pit_probability > 0.6 and competitor.strategic_threat_level in ["medium", "high"]:
-                opportunity = {
-                    "type": "undercut_window",
-                    "target_car": competitor.car_id,
-                    "probability": min(0.9, competitor.pit_probability * 
-                                     competitor.behavioral_profile["undercut_tendency"]),
-                    "execution_lap": max(1, self.current_lap + 1),
-                    "reasoning": f"High pit probability ({competitor.pit_probability:.2f}) for {competitor.car_id}"
-                }
-                self.strategic_opportunities.append(opportunity)
-            
-            # Check for overcut opportunities
-            if (competitor.tire_age > 15 and competitor.pit_probability < 0.3 and 
-                competitor.strategic_threat_level != "low"):
-                opportunity = {
-                    "type": "overcut_window",
-                    "target_car": competitor.car_id,
-                    "probability": 0.6,
-                    "execution_lap": self.current_lap + 3,
-                    "reasoning": f"Old tires ({competitor.tire_age} laps) but low pit probability"
-                }
-                self.strategic_opportunities.append(opportunity)
-            
-            # Check for DRS overtake opportunities
-            gap = abs(competitor.gap_to_leader - self.our_gap_to_leader)
-            if (gap < 1.0 and competitor.current_position in [self.our_position - 1, self.our_position + 1] and
-                self.track_status == "green"):
-                opportunity = {
-                    "type": "drs_overtake",
-                    "target_car": competitor.car_id,
-                    "probability": 0.4,
-                    "execution_lap": self.current_lap,
-                    "reasoning": f"Close gap ({gap:.1f}s) and adjacent position"
-                }
-                self.strategic_opportunities.append(opportunity)
-        
-        # Sort opportunities by probability
-        self.strategic_opportunities.sort(key=lambda x: x["probability"], reverse=True)
+        table = self._competitor_table
+        pit_prob = table.pit_prob
+        threat_code = table.threat_code
+        our_pos = self.our_position
+        our_gap = self.our_gap_to_leader
+        current_lap = self.current_lap
         
-        # Keep only top 5 opportunities
-        self.strategic_opportunities = self.strategic_opportunities[:5]
+        # Undercut: likely to pit soon and a medium or high threat
+        undercut = (pit_prob > 0.6) & (threat_code >= Threat.MEDIUM) & (threat_code <= Threat.HIGH)
+        # Overcut: old tires but unlikely to pit
+        overcut = (table.tire_age > 15) & (pit_prob < 0.3) & (threat_code != Threat.LOW)
+        # DRS overtake: close gap and adjacent position on a green track
+        gaps = np.abs(table.gap - our_gap)
+        if self.track_status == "green":
+            drs = (gaps < 1.0) & (np.abs(table.pos.astype(np.int64) - our_pos) == 1)
+        else:
+            drs = np.zeros(len(table.car_ids), dtype=bool)
+        undercut_probs = np.minimum(0.9, pit_prob * table.undercut_tend)
+        
+        # Materialize opportunities for surviving rows only, straight from the
+        # table columns, then order them per competitor in undercut, overcut,
+        # DRS order
+        car_ids = table.car_ids
+        hits = []
+        rows = np.flatnonzero(undercut)
+        hits.extend(
+            (row, 0, Opportunity(
+                type="undercut_window",
+                target_car=car_ids[row],
+                probability=probability,
+                execution_lap=max(1, current_lap + 1),
+                reasoning=f"High pit probability ({pit:.2f}) for {car_ids[row]}"
+            ))
+            for row, probability, pit in zip(
+                rows.tolist(), undercut_probs[rows].tolist(), pit_prob[rows].tolist()
+            )
+        )
+        rows = np.flatnonzero(overcut)
+        hits.extend(
+            (row, 1, Opportunity(
+                type="overcut_window",
+                target_car=car_ids[row],
+                probability=0.6,
+                execution_lap=current_lap + 3,
+                reasoning=f"Old tires ({tire_age} laps) but low pit probability"
+            ))
+            for row, tire_age in zip(rows.tolist(), table.tire_age[rows].tolist())
+        )
+        rows = np.flatnonzero(drs)
+        hits.extend(
+            (row, 2, Opportunity(
+                type="drs_overtake",
+                target_car=car_ids[row],
+                probability=0.4,
+                execution_lap=current_lap,
+                reasoning=f"Close gap ({gap:.1f}s) and adjacent position"
+            ))
+            for row, gap in zip(rows.tolist(), gaps[rows].tolist())
+        )
+        hits.sort(key=itemgetter(0, 1))
+        opportunities = [hit[2] for hit in hits]
+        
+        # Keep only the top 5 opportunities by probability
+        self.strategic_opportunities = heapq.nlargest(
+            5, opportunities, key=attrgetter("probability")
+        )
+        self._reset_earliest_opportunity_lap()
     
     def _get_twin_specific_state(self) -> Dict[str, Any]:
         """
@@ -807,13 +1879,9 @@ class FieldTwin(BaseTwinModel):
         Returns:
             Field Twin state dictionary
         """
-        competitors_state = []
-        for competitor in self.competitors.values():
-            competitors_state.append(competitor.get_state_dict())
-        
         return {
-            "competitors": competitors_state,
-            "strategic_opportunities": self.strategic_opportunities,
+            "competitors": self.get_all_competitor_states(),
+            "strategic_opportunities": self.get_strategic_opportunities(),
             "race_context": {
                 "current_lap": self.current_lap,
                 "total_laps": self.total_laps,
@@ -822,7 +1890,7 @@ class FieldTwin(BaseTwinModel):
                 "our_position": self.our_position,
                 "our_gap_to_leader": self.our_gap_to_leader
             },
-            "recent_events": self.race_events[-10:] if self.race_events else []
+            "recent_events": list(self._recent_events)
         }
     
     def _generate_predictions(self, horizon_seconds: int) -> Dict[str, Any]:
@@ -846,43 +1914,51 @@ class FieldTwin(BaseTwinModel):
         
         future_laps = max(1, horizon_seconds // 90)  # Assume ~90s per lap
         
-        # Generate predictions for each competitor
-        for car_id, competitor in self.competitors.items():
-            competitor_pred = self._predict_competitor_behavior(competitor, future_laps, horizon_seconds)
-            predictions["competitor_predictions"][car_id] = competitor_pred
-        
-        # Predict strategic opportunities and windows
-        predictions["strategic_windows"] = self._predict_strategic_windows(future_laps)
-        
-        # Predict race events
-        predictions["race_event_predictions"] = self._predict_race_events(future_laps)
-        
-        # Strategic forecast
-        for opportunity in self.strategic_opportunities:
-            if opportunity["execution_lap"] <= self.current_lap + future_laps:
-                predictions["strategic_forecast"].append({
-                    "opportunity": opportunity,
-                    "time_to_execution": (opportunity["execution_lap"] - self.current_lap) * 90,
-                    "success_factors": self._analyze_opportunity_factors(opportunity),
-                    "predicted_outcome": self._predict_opportunity_outcome(opportunity)
-                })
-        
-        # Risk assessment
-        predictions["risk_assessment"] = self._predict_strategic_risks(future_laps)
+        # Competitor state does not change during a prediction pass, so share
+        # per-competitor results between the prediction steps
+        self._pred_cache = self._predict_field_batch(future_laps)
+        try:
+            # Generate predictions for each competitor
+            competitors = self._competitor_list
+            for competitor in competitors:
+                predictions["competitor_predictions"][competitor.car_id] = (
+                    self._predict_competitor_behavior(competitor, future_laps, horizon_seconds)
+                )
+            
+            # Predict strategic opportunities and windows
+            predictions["strategic_windows"] = self._predict_strategic_windows(future_laps, competitors)
+            
+            # Predict race events
+            predictions["race_event_predictions"] = self._predict_race_events(future_laps, competitors)
+            
+            # Strategic forecast
+            for opportunity in self.strategic_opportunities:
+                if opportunity.execution_lap <= self.current_lap + future_laps:
+                    predictions["strategic_forecast"].append({
+                        "opportunity": opportunity.to_dict(),
+                        "time_to_execution": (opportunity.execution_lap - self.current_lap) * 90,
+                        "success_factors": self._analyze_opportunity_factors(opportunity),
+                        "predicted_outcome": self._predict_opportunity_outcome(opportunity)
+                    })
+            
+            # Risk assessment
+            predictions["risk_assessment"] = self._predict_strategic_risks(future_laps, competitors)
+        finally:
+            self._pred_cache = None
         
         return predictions
     
-    def _analyze_opportunity_factors(self, opportunity: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_opportunity_factors(self, opportunity: Opportunity) -> Dict[str, Any]:
         """
         Analyze factors affecting opportunity success.
         
         Args:
-            opportunity: Strategic opportunity data
+            opportunity: Strategic opportunity
             
         Returns:
             Success factors analysis
         """
-        target_car = opportunity["target_car"]
+        target_car = opportunity.target_car
         if target_car not in self.competitors:
             return {"error": "Target car not found"}
         
@@ -896,7 +1972,7 @@ class FieldTwin(BaseTwinModel):
         }
         
         # Analyze tire advantage
-        if opportunity["type"] == "undercut_window":
+        if opportunity.type == "undercut_window":
             factors["tire_advantage"] = min(1.0, competitor.tire_age / 20.0)
         
         # Analyze position advantage
@@ -904,19 +1980,29 @@ class FieldTwin(BaseTwinModel):
         factors["position_advantage"] = max(0.0, 1.0 - (position_diff / 5.0))
         
         # Analyze timing
-        if opportunity["execution_lap"] == self.current_lap:
+        if opportunity.execution_lap == self.current_lap:
             factors["timing_advantage"] = 1.0
         else:
-            factors["timing_advantage"] = max(0.0, 1.0 - abs(opportunity["execution_lap"] - self.current_lap) / 5.0)
+            factors["timing_advantage"] = max(0.0, 1.0 - abs(opportunity.execution_lap - self.current_lap) / 5.0)
         
         # Behavioral factor
-        if opportunity["type"] == "undercut_window":
-            factors["behavioral_factor"] = 1.0 - competitor.behavioral_profile["aggressive_defense"]
+        if opportunity.type == "undercut_window":
+            factors["behavioral_factor"] = 1.0 - competitor.behavioral_profile.aggressive_defense
         else:
-            factors["behavioral_factor"] = competitor.behavioral_profile["tire_management"]
+            factors["behavioral_factor"] = competitor.behavioral_profile.tire_management
         
         return factors
     
+    @property
+    def competitor_table(self) -> CompetitorTable:
+        """
+        Per-competitor columns in tracking order.
+        
+        The columns are refreshed on every telemetry update, so callers must
+        treat them as read-only.
+        """
+        return self._competitor_table
+    
     def get_competitor_count(self) -> int:
         """Get number of tracked competitors."""
         return len(self.competitors)
@@ -933,13 +2019,59 @@ class FieldTwin(BaseTwinModel):
         """
         return self.competitors.get(car_id)
     
+    def get_all_competitor_states(self) -> List[Dict[str, Any]]:
+        """
+        Get state dictionaries for all competitors.
+        
+        Each dictionary is the competitor's cached get_state_dict result, so
+        callers must treat them as read-only.
+        
+        Returns:
+            List of competitor state dictionaries
+        """
+        return [competitor.get_state_dict() for competitor in self.competitors.values()]
+    
+    @property
+    def strategic_opportunities(self) -> List[Opportunity]:
+        """Current strategic opportunities, best first."""
+        return self._strategic_opportunities
+    
+    @strategic_opportunities.setter
+    def strategic_opportunities(self, opportunities: List[Opportunity]) -> None:
+        # The list is always replaced rather than mutated, so replacing it is
+        # the only point where the getter snapshot goes stale
+        self._strategic_opportunities = opportunities
+        self._opportunity_snapshot = None
+    
     def get_strategic_opportunities(self) -> List[Dict[str, Any]]:
-        """Get current strategic opportunities."""
-        return self.strategic_opportunities.copy()
+        """
+        Get current strategic opportunities.
+        
+        The list is shared until the opportunities next change, so callers
+        must treat it as read-only.
+        
+        Returns:
+            Strategic opportunity dictionaries
+        """
+        if self._opportunity_snapshot is None:
+            self._opportunity_snapshot = [
+                opportunity.to_dict() for opportunity in self._strategic_opportunities
+            ]
+        return self._opportunity_snapshot
     
     def get_race_events(self) -> List[Dict[str, Any]]:
-        """Get recent race events."""
-        return self.race_events.copy()
+        """
+        Get recent race events.
+        
+        The list is shared until the next race event is recorded, so callers
+        must treat it as read-only.
+        
+        Returns:
+            Race event dictionaries, oldest first
+        """
+        if self._race_event_snapshot is None:
+            self._race_event_snapshot = list(self.race_events)
+        return self._race_event_snapshot
     
     def _predict_competitor_behavior(self, competitor: CompetitorModel, future_laps: int, horizon_seconds: int) -> Dict[str, Any]:
         """
@@ -1000,50 +2132,15 @@ class FieldTwin(BaseTwinModel):
         Returns:
             Pit timing predictions
         """
-        pit_windows = []
-        current_pit_prob = competitor.pit_probability
-        
-        # Analyze pit probability evolution
-        for lap_offset in range(1, min(future_laps + 1, 20)):  # Look ahead max 20 laps
-            future_lap = self.current_lap + lap_offset
-            future_tire_age = competitor.tire_age + lap_offset
-            
-            # Calculate pit probability for this future lap
-            tire_factor = min(1.0, (future_tire_age / 25.0) + (competitor.tire_wear * 0.5))
-            
-            # Strategy-based probability
-            strategy_factor = 0.0
-            if competitor.predicted_strategy == "two_stop":
-                if len(competitor.pit_stops) == 0:
-                    if 15 <= future_lap <= 35:
-                        strategy_factor = 0.7 - (abs(future_lap - 25) * 0.02)
-                elif len(competitor.pit_stops) == 1:
-                    if 35 <= future_lap <= 50:
-                        strategy_factor = 0.8 - (abs(future_lap - 42) * 0.03)
-            elif competitor.predicted_strategy == "one_stop":
-                if len(competitor.pit_stops) == 0 and 25 <= future_lap <= 40:
-                    strategy_factor = 0.6 - (abs(future_lap - 32) * 0.02)
-            
-            # Fuel urgency
-            fuel_per_lap = competitor.fuel_consumption_rate / 100.0
-            predicted_fuel = max(0.0, competitor.fuel_level - (fuel_per_lap * lap_offset))
-            fuel_factor = max(0.0, 1.0 - (predicted_fuel / 0.2))  # Critical below 20%
-            
-            lap_pit_prob = min(1.0, tire_factor * 0.4 + strategy_factor * 0.4 + fuel_factor * 0.2)
-            
-            if lap_pit_prob > 0.5:
-                pit_windows.append({
-                    "lap": future_lap,
-                    "probability": lap_pit_prob,
-                    "tire_age": future_tire_age,
-                    "fuel_level": predicted_fuel,
-                    "primary_factor": "tire" if tire_factor > strategy_factor else "strategy"
-                })
+        # Windows up to the horizon, a prefix of the lap-ordered full look-ahead
+        last_lap = self.current_lap + min(future_laps, PIT_LOOKAHEAD_LAPS)
+        all_windows = self._predict_pit_windows(competitor)
+        pit_windows = all_windows[:bisect_right(all_windows, last_lap, key=itemgetter("lap"))]
         
         # Find most likely pit window
         most_likely_pit = None
         if pit_windows:
-            most_likely_pit = max(pit_windows, key=lambda x: x["probability"])
+            most_likely_pit = max(pit_windows, key=itemgetter("probability"))
         
         return {
             "most_likely_lap": most_likely_pit["lap"] if most_likely_pit else None,
@@ -1052,6 +2149,57 @@ class FieldTwin(BaseTwinModel):
             "strategy_confidence": self._calculate_strategy_confidence(competitor)
         }
     
+    def _predict_pit_windows(self, competitor: CompetitorModel) -> List[Dict[str, Any]]:
+        """
+        Predict likely pit laps over the full look-ahead.
+        
+        Every horizon shares the same per-lap evaluation, so within a
+        prediction pass the result is computed once per competitor.
+        
+        Args:
+            competitor: Competitor model
+            
+        Returns:
+            Pit windows in lap order
+        """
+        cache = self._pred_cache["pit_windows"] if self._pred_cache is not None else None
+        if cache is not None and competitor.car_id in cache:
+            return cache[competitor.car_id]
+        
+        # Evaluate every look-ahead lap at once; competitor values are constant
+        lap_offsets = np.arange(1, PIT_LOOKAHEAD_LAPS + 1)
+        future_laps = self.current_lap + lap_offsets
+        future_tire_age = competitor.tire_age + lap_offsets
+        lap_pit_prob, tire_factor, strategy_factor, predicted_fuel = _pit_window_kernel(
+            lap_offsets, self.current_lap, competitor.tire_age, competitor.tire_wear,
+            competitor.fuel_level, competitor.fuel_consumption_rate / 100.0,
+            competitor.strategy_code, competitor.pit_stop_count, self._pit_window_factor_table
+        )
+        
+        # Build windows only for laps above the pit threshold
+        likely = np.flatnonzero(lap_pit_prob > 0.5)
+        pit_windows = [
+            {
+                "lap": lap,
+                "probability": probability,
+                "tire_age": tire_age,
+                "fuel_level": fuel_level,
+                "primary_factor": "tire" if tire > strategy else "strategy"
+            }
+            for lap, probability, tire_age, fuel_level, tire, strategy in zip(
+                future_laps[likely].tolist(),
+                lap_pit_prob[likely].tolist(),
+                future_tire_age[likely].tolist(),
+                predicted_fuel[likely].tolist(),
+                tire_factor[likely].tolist(),
+                strategy_factor[likely].tolist()
+            )
+        ]
+        
+        if cache is not None:
+            cache[competitor.car_id] = pit_windows
+        return pit_windows
+    
     def _predict_performance_evolution(self, competitor: CompetitorModel, future_laps: int) -> Dict[str, Any]:
         """
         Predict how competitor performance will evolve.
@@ -1064,14 +2212,15 @@ class FieldTwin(BaseTwinModel):
             Performance evolution predictions
         """
         # Base performance from recent lap times
-        if len(competitor.lap_times_history) >= 3:
-            recent_times = [entry["lap_time"] for entry in list(competitor.lap_times_history)[-5:]]
-            base_performance = sum(recent_times) / len(recent_times)
+        if competitor.lap_history_count >= 3:
+            base_performance = competitor.recent_avg
         else:
             base_performance = competitor.last_lap_time if competitor.last_lap_time > 0 else 85.0
         
         # Predict performance degradation
         performance_evolution = []
+        peak_performance_lap = 0
+        best_lap_time = 0.0
         for lap_offset in range(1, min(future_laps + 1, 15)):
             future_tire_age = competitor.tire_age + lap_offset
             
@@ -1095,13 +2244,18 @@ class FieldTwin(BaseTwinModel):
                 "fuel_benefit": fuel_benefit,
                 "relative_performance": predicted_lap_time - base_performance
             })
+            
+            # Best predicted lap, keeping the first of equal minimums
+            if not peak_performance_lap or predicted_lap_time < best_lap_time:
+                peak_performance_lap = lap_offset
+                best_lap_time = predicted_lap_time
         
         return {
             "base_performance": base_performance,
             "evolution": performance_evolution,
-            "peak_performance_lap": self._find_peak_performance_lap(performance_evolution),
+            "peak_performance_lap": peak_performance_lap,
             "degradation_trend": competitor.degradation_rate,
-            "tire_management_factor": competitor.behavioral_profile["tire_management"]
+            "tire_management_factor": competitor.behavioral_profile.tire_management
         }
     
     def _predict_strategic_behavior(self, competitor: CompetitorModel, future_laps: int) -> Dict[str, Any]:
@@ -1119,47 +2273,54 @@ class FieldTwin(BaseTwinModel):
             "undercut_likelihood": [],
             "defensive_actions": [],
             "strategic_responses": [],
-            "risk_taking_tendency": competitor.behavioral_profile["aggressive_defense"]
+            "risk_taking_tendency": competitor.behavioral_profile.aggressive_defense
         }
         
+        # Undercut likelihood based on position and behavioral profile; these
+        # terms and the confidence do not change from lap to lap
+        base_score = 0.0
+        
+        # Position pressure factor
+        if competitor.current_position > 1:  # Not leading
+            position_pressure = min(1.0, (competitor.current_position - 1) / 10.0)
+            base_score += position_pressure * 0.3
+        
+        # Behavioral tendency
+        base_score += competitor.behavioral_profile.undercut_tendency * 0.4
+        
+        confidence = self._calculate_behavior_confidence(competitor)
+        current_lap = self.current_lap
+        tire_age = competitor.tire_age
+        undercut_likelihood = behavior_predictions["undercut_likelihood"]
+        
         # Predict undercut attempts
         for lap_offset in range(1, min(future_laps + 1, 10)):
-            future_lap = self.current_lap + lap_offset
-            
-            # Undercut likelihood based on position and behavioral profile
-            undercut_score = 0.0
-            
-            # Position pressure factor
-            if competitor.current_position > 1:  # Not leading
-                position_pressure = min(1.0, (competitor.current_position - 1) / 10.0)
-                undercut_score += position_pressure * 0.3
-            
-            # Behavioral tendency
-            undercut_score += competitor.behavioral_profile["undercut_tendency"] * 0.4
+            future_lap = current_lap + lap_offset
+            undercut_score = base_score
             
             # Strategic window factor
             if 15 <= future_lap <= 35:  # Prime undercut window
                 undercut_score += 0.3
             
             # Tire age factor
-            future_tire_age = competitor.tire_age + lap_offset
+            future_tire_age = tire_age + lap_offset
             if future_tire_age >= 10:
                 undercut_score += min(0.2, (future_tire_age - 10) * 0.02)
             
-            behavior_predictions["undercut_likelihood"].append({
+            undercut_likelihood.append({
                 "lap": future_lap,
                 "probability": min(1.0, undercut_score),
-                "confidence": self._calculate_behavior_confidence(competitor)
+                "confidence": confidence
             })
         
         # Predict defensive actions
         if competitor.current_position <= 5:  # Top 5 positions more likely to defend
-            defense_probability = competitor.behavioral_profile["aggressive_defense"]
+            defense_probability = competitor.behavioral_profile.aggressive_defense
             behavior_predictions["defensive_actions"] = [{
                 "type": "position_defense",
                 "probability": defense_probability,
                 "triggers": ["close_following_car", "drs_zone_approach"],
-                "effectiveness": competitor.behavioral_profile["tire_management"]
+                "effectiveness": competitor.behavioral_profile.tire_management
             }]
         
         # Predict strategic responses to our actions
@@ -1168,25 +2329,29 @@ class FieldTwin(BaseTwinModel):
         
         return behavior_predictions
     
-    def _predict_strategic_windows(self, future_laps: int) -> List[Dict[str, Any]]:
+    def _predict_strategic_windows(self, future_laps: int,
+                                   competitors: List[CompetitorModel]) -> List[Dict[str, Any]]:
         """
         Predict upcoming strategic windows and opportunities.
         
         Args:
             future_laps: Prediction horizon in laps
+            competitors: Competitors tracked in this prediction pass
             
         Returns:
             List of predicted strategic windows
         """
         windows = []
+        current_lap = self.current_lap
+        horizon_end = current_lap + future_laps
         
         # Analyze pit window opportunities
         for lap_offset in range(1, min(future_laps + 1, 15)):
-            future_lap = self.current_lap + lap_offset
+            future_lap = current_lap + lap_offset
             
             # Count competitors likely to pit
             pit_candidates = []
-            for competitor in self.competitors.values():
+            for competitor in competitors:
                 pit_pred = self._predict_pit_timing(competitor, lap_offset + 5)
                 if pit_pred["most_likely_lap"] and abs(pit_pred["most_likely_lap"] - future_lap) <= 2:
                     pit_candidates.append({
@@ -1204,60 +2369,63 @@ class FieldTwin(BaseTwinModel):
                     "execution_complexity": "medium"
                 })
         
-        # Analyze undercut/overcut windows
-        for competitor in self.competitors.values():
-            if competitor.strategic_threat_level in ["medium", "high", "critical"]:
-                pit_pred = self._predict_pit_timing(competitor, future_laps)
-                if pit_pred["most_likely_lap"]:
-                    # Undercut window (pit 1-2 laps before competitor)
-                    undercut_lap = max(1, pit_pred["most_likely_lap"] - 2)
-                    if undercut_lap <= self.current_lap + future_laps:
-                        windows.append({
-                            "type": "undercut_window",
-                            "lap": undercut_lap,
-                            "target_competitor": competitor.car_id,
-                            "success_probability": pit_pred["highest_probability"] * competitor.behavioral_profile["undercut_tendency"],
-                            "strategic_value": self._calculate_strategic_value(competitor, "undercut"),
-                            "execution_complexity": "low"
-                        })
-                    
-                    # Overcut window (stay out longer)
-                    overcut_lap = pit_pred["most_likely_lap"] + 3
-                    if overcut_lap <= self.current_lap + future_laps:
-                        windows.append({
-                            "type": "overcut_window",
-                            "lap": overcut_lap,
-                            "target_competitor": competitor.car_id,
-                            "success_probability": (1.0 - pit_pred["highest_probability"]) * (1.0 - competitor.behavioral_profile["aggressive_defense"]),
-                            "strategic_value": self._calculate_strategic_value(competitor, "overcut"),
-                            "execution_complexity": "medium"
-                        })
-        
-        # Sort by strategic value and return top windows
-        windows.sort(key=lambda x: x["strategic_value"], reverse=True)
-        return windows[:10]
-    
-    def _predict_race_events(self, future_laps: int) -> List[Dict[str, Any]]:
+        # Analyze undercut/overcut windows for threatening competitors only
+        threat_candidates = [c for c in competitors if c.threat_code >= Threat.MEDIUM]
+        for competitor in threat_candidates:
+            pit_pred = self._predict_pit_timing(competitor, future_laps)
+            most_likely_lap = pit_pred["most_likely_lap"]
+            # Skip competitors whose undercut window already falls past the
+            # horizon; their overcut window is later still
+            if not most_likely_lap or most_likely_lap - 2 > horizon_end:
+                continue
+            
+            # Undercut window (pit 1-2 laps before competitor)
+            undercut_lap = max(1, most_likely_lap - 2)
+            windows.append({
+                "type": "undercut_window",
+                "lap": undercut_lap,
+                "target_competitor": competitor.car_id,
+                "success_probability": pit_pred["highest_probability"] * competitor.behavioral_profile.undercut_tendency,
+                "strategic_value": self._calculate_strategic_value(competitor, "undercut"),
+                "execution_complexity": "low"
+            })
+            
+            # Overcut window (stay out longer)
+            overcut_lap = most_likely_lap + 3
+            if overcut_lap <= horizon_end:
+                windows.append({
+                    "type": "overcut_window",
+                    "lap": overcut_lap,
+                    "target_competitor": competitor.car_id,
+                    "success_probability": (1.0 - pit_pred["highest_probability"]) * (1.0 - competitor.behavioral_profile.aggressive_defense),
+                    "strategic_value": self._calculate_strategic_value(competitor, "overcut"),
+                    "execution_complexity": "medium"
+                })
+        
+        # Return the top windows by strategic value
+        return heapq.nlargest(10, windows, key=itemgetter("strategic_value"))
+    
+    def _predict_race_events(self, future_laps: int,
+                             competitors: List[CompetitorModel]) -> List[Dict[str, Any]]:
         """
         Predict likely race events that could affect strategy.
         
         Args:
             future_laps: Prediction horizon in laps
+            competitors: Competitors tracked in this prediction pass
             
         Returns:
             List of predicted race events
         """
+        # Events paired with the lap they are ordered by
         events = []
         
         # Predict pit stop waves
-        pit_activity_by_lap = {}
-        for competitor in self.competitors.values():
+        pit_activity_by_lap = defaultdict(list)
+        for competitor in competitors:
             pit_pred = self._predict_pit_timing(competitor, future_laps)
             for window in pit_pred["pit_windows"]:
-                lap = window["lap"]
-                if lap not in pit_activity_by_lap:
-                    pit_activity_by_lap[lap] = []
-                pit_activity_by_lap[lap].append({
+                pit_activity_by_lap[window["lap"]].append({
                     "car_id": competitor.car_id,
                     "probability": window["probability"]
                 })
@@ -1266,48 +2434,52 @@ class FieldTwin(BaseTwinModel):
         for lap, activity in pit_activity_by_lap.items():
             if len(activity) >= 3:  # 3+ cars likely to pit
                 total_probability = sum(car["probability"] for car in activity)
-                events.append({
+                events.append((lap, {
                     "type": "pit_stop_wave",
                     "lap": lap,
                     "probability": min(1.0, total_probability / len(activity)),
                     "affected_cars": [car["car_id"] for car in activity],
                     "strategic_impact": "high",
                     "preparation_required": True
-                })
+                }))
         
         # Predict position battles
         close_battles = self._identify_close_battles()
+        battle_start = self.current_lap + 1
         for battle in close_battles:
-            events.append({
+            events.append((battle_start, {
                 "type": "position_battle",
-                "lap_range": [self.current_lap + 1, self.current_lap + 5],
+                "lap_range": [battle_start, self.current_lap + 5],
                 "probability": 0.7,
                 "involved_cars": battle["cars"],
                 "strategic_impact": "medium",
                 "drs_factor": True
-            })
+            }))
         
         # Predict fuel-critical situations
-        for competitor in self.competitors.values():
+        for competitor in competitors:
             critical_lap = self._predict_fuel_critical_lap(competitor)
             if critical_lap and critical_lap <= self.current_lap + future_laps:
-                events.append({
+                events.append((critical_lap, {
                     "type": "fuel_critical",
                     "lap": critical_lap,
                     "car_id": competitor.car_id,
                     "probability": 0.8,
                     "strategic_impact": "high",
                     "forced_pit_stop": True
-                })
+                }))
         
-        return sorted(events, key=lambda x: x.get("lap", x.get("lap_range", [0])[0]))
+        events.sort(key=itemgetter(0))
+        return [event for _, event in events]
     
-    def _predict_strategic_risks(self, future_laps: int) -> Dict[str, Any]:
+    def _predict_strategic_risks(self, future_laps: int,
+                                 competitors: List[CompetitorModel]) -> Dict[str, Any]:
         """
         Predict strategic risks over the time horizon.
         
         Args:
             future_laps: Prediction horizon in laps
+            competitors: Competitors tracked in this prediction pass
             
         Returns:
             Risk assessment predictions
@@ -1320,23 +2492,31 @@ class FieldTwin(BaseTwinModel):
             "overall_risk_level": "low"
         }
         
-        # Analyze undercut risks
-        for competitor in self.competitors.values():
-            if (competitor.behavioral_profile["undercut_tendency"] > 0.6 and 
-                competitor.strategic_threat_level in ["medium", "high", "critical"]):
+        # Analyze undercut risks for likely undercutters that threaten us,
+        # counting high and medium risks as we go
+        candidates = [
+            c for c in competitors
+            if c.behavioral_profile.undercut_tendency > 0.6 and c.threat_code >= Threat.MEDIUM
+        ]
+        high_risks = 0
+        medium_risks = 0
+        for competitor in candidates:
+            pit_pred = self._predict_pit_timing(competitor, future_laps)
+            if pit_pred["most_likely_lap"]:
+                risk_score = (competitor.behavioral_profile.undercut_tendency * 
+                             pit_pred["highest_probability"] * 
+                             self._get_threat_multiplier(competitor.threat_code))
+                if risk_score > 0.7:
+                    high_risks += 1
+                elif risk_score >= 0.4:
+                    medium_risks += 1
                 
-                pit_pred = self._predict_pit_timing(competitor, future_laps)
-                if pit_pred["most_likely_lap"]:
-                    risk_score = (competitor.behavioral_profile["undercut_tendency"] * 
-                                 pit_pred["highest_probability"] * 
-                                 self._get_threat_multiplier(competitor.strategic_threat_level))
-                    
-                    risks["undercut_risks"].append({
-                        "car_id": competitor.car_id,
-                        "risk_score": risk_score,
-                        "likely_execution_lap": pit_pred["most_likely_lap"] - 1,
-                        "mitigation_window": [pit_pred["most_likely_lap"] - 3, pit_pred["most_likely_lap"] - 1]
-                    })
+                risks["undercut_risks"].append({
+                    "car_id": competitor.car_id,
+                    "risk_score": risk_score,
+                    "likely_execution_lap": pit_pred["most_likely_lap"] - 1,
+                    "mitigation_window": [pit_pred["most_likely_lap"] - 3, pit_pred["most_likely_lap"] - 1]
+                })
         
         # Analyze position loss risks
         position_risks = self._analyze_position_loss_risks(future_laps)
@@ -1346,9 +2526,6 @@ class FieldTwin(BaseTwinModel):
         risks["strategic_isolation_risk"] = self._calculate_isolation_risk()
         
         # Determine overall risk level
-        high_risks = len([r for r in risks["undercut_risks"] if r["risk_score"] > 0.7])
-        medium_risks = len([r for r in risks["undercut_risks"] if 0.4 <= r["risk_score"] <= 0.7])
-        
         if high_risks >= 2 or risks["strategic_isolation_risk"] > 0.8:
             risks["overall_risk_level"] = "critical"
         elif high_risks >= 1 or medium_risks >= 3:
@@ -1358,24 +2535,24 @@ class FieldTwin(BaseTwinModel):
         
         return risks
     
-    def _predict_opportunity_outcome(self, opportunity: Dict[str, Any]) -> Dict[str, Any]:
+    def _predict_opportunity_outcome(self, opportunity: Opportunity) -> Dict[str, Any]:
         """
         Predict the likely outcome of executing a strategic opportunity.
         
         Args:
-            opportunity: Strategic opportunity data
+            opportunity: Strategic opportunity
             
         Returns:
             Predicted outcome analysis
         """
-        target_car = opportunity["target_car"]
+        target_car = opportunity.target_car
         competitor = self.competitors.get(target_car)
         
         if not competitor:
             return {"success_probability": 0.0, "error": "Target competitor not found"}
         
         outcome = {
-            "success_probability": opportunity["probability"],
+            "success_probability": opportunity.probability,
             "position_gain_expected": 0,
             "time_advantage_expected": 0.0,
             "risk_factors": [],
@@ -1383,7 +2560,7 @@ class FieldTwin(BaseTwinModel):
             "failure_scenarios": []
         }
         
-        if opportunity["type"] == "undercut_window":
+        if opportunity.type == "undercut_window":
             # Predict undercut outcome
             tire_advantage = max(0, competitor.tire_age - 5) * 0.1  # Fresher tires advantage
             position_diff = abs(competitor.current_position - self.our_position)
@@ -1403,13 +2580,13 @@ class FieldTwin(BaseTwinModel):
                 ]
             
             # Risk factors
-            if competitor.behavioral_profile["aggressive_defense"] > 0.7:
+            if competitor.behavioral_profile.aggressive_defense > 0.7:
                 outcome["risk_factors"].append("Aggressive defensive response expected")
             
             if competitor.pit_probability < 0.6:
                 outcome["risk_factors"].append("Uncertain competitor pit timing")
         
-        elif opportunity["type"] == "overcut_window":
+        elif opportunity.type == "overcut_window":
             # Predict overcut outcome
             tire_degradation_risk = competitor.tire_age * competitor.degradation_rate
             fuel_advantage = (competitor.fuel_level - 0.3) * 2.0  # Fuel weight advantage
@@ -1434,8 +2611,88 @@ class FieldTwin(BaseTwinModel):
     
     # Helper methods for predictions
     
+    def _predict_field_batch(self, future_laps: int) -> Dict[str, Any]:
+        """
+        Run the fused per-competitor prediction kernel over the whole field.
+        
+        Args:
+            future_laps: Prediction horizon in laps
+            
+        Returns:
+            Per-pass prediction cache: lap time evolution matrices plus
+            fuel-critical laps and confidences keyed by car ID
+        """
+        table = self._competitor_table
+        lap_offsets = np.arange(1, min(future_laps + 1, 10))
+        n = len(table.car_ids)
+        evolution = np.empty((n, lap_offsets.shape[0]), dtype=LAP_PREDICTION_DTYPE)
+        evolution["lap_offset"] = lap_offsets
+        evolution["tire_age"] = table.tire_age[:, None] + lap_offsets
+        fuel_critical = np.empty(n, dtype=np.int64)
+        strategy_conf = np.empty(n, dtype=np.float64)
+        behavior_conf = np.empty(n, dtype=np.float64)
+        _predict_field(
+            lap_offsets, self.current_lap, table.tire_age, table.last_lap_time,
+            table.degradation_rate, table.fuel_rate, table.fuel_level, table.lap_count,
+            table.position_count, table.pit_count, table.tire_mgmt,
+            evolution["degradation_impact"], evolution["predicted_lap_time"],
+            fuel_critical, strategy_conf, behavior_conf
+        )
+        
+        car_ids = table.car_ids
+        return {
+            "pit_windows": {},
+            "fuel_critical": {
+                car_id: lap if lap >= 0 else None
+                for car_id, lap in zip(car_ids, fuel_critical.tolist())
+            },
+            "strategy_confidence": dict(zip(car_ids, strategy_conf.tolist())),
+            "behavior_confidence": dict(zip(car_ids, behavior_conf.tolist())),
+            "lap_evolution": (
+                future_laps,
+                evolution,
+                # Per-field Python lists for building the published dicts
+                (
+                    lap_offsets.tolist(),
+                    evolution["predicted_lap_time"].tolist(),
+                    evolution["tire_age"].tolist(),
+                    evolution["degradation_impact"].tolist()
+                )
+            )
+        }
+    
+    def predict_all_lap_evolutions(self, future_laps: int) -> np.ndarray:
+        """
+        Predict lap time evolution for every competitor at once.
+        
+        Args:
+            future_laps: Prediction horizon in laps
+            
+        Returns:
+            ``LAP_PREDICTION_DTYPE`` records of shape (competitors, laps),
+            with rows in competitor table order
+        """
+        return self._predict_field_batch(future_laps)["lap_evolution"][1]
+    
     def _predict_lap_time_evolution(self, competitor: CompetitorModel, future_laps: int) -> List[Dict[str, Any]]:
         """Predict how lap times will evolve."""
+        # Use this competitor's row of the batch prediction when available
+        batch = self._pred_cache["lap_evolution"] if self._pred_cache is not None else None
+        row = self._competitor_table.rows.get(competitor.car_id)
+        if batch is not None and batch[0] == future_laps and row is not None:
+            lap_offsets, lap_times, tire_ages, degradations = batch[2]
+            return [
+                {
+                    "lap_offset": lap_offset,
+                    "predicted_lap_time": predicted_time,
+                    "tire_age": future_tire_age,
+                    "degradation_impact": degradation
+                }
+                for lap_offset, predicted_time, future_tire_age, degradation in zip(
+                    lap_offsets, lap_times[row], tire_ages[row], degradations[row]
+                )
+            ]
+        
         evolution = []
         base_time = competitor.last_lap_time if competitor.last_lap_time > 0 else 85.0
         
@@ -1457,24 +2714,35 @@ class FieldTwin(BaseTwinModel):
     
     def _predict_fuel_critical_lap(self, competitor: CompetitorModel) -> Optional[int]:
         """Predict when competitor will reach critical fuel level."""
-        if competitor.fuel_level <= 0.1:  # Already critical
-            return self.current_lap
+        cache = self._pred_cache["fuel_critical"] if self._pred_cache is not None else None
+        if cache is not None and competitor.car_id in cache:
+            return cache[competitor.car_id]
         
         fuel_per_lap = competitor.fuel_consumption_rate / 100.0
-        critical_threshold = 0.05  # 5% fuel remaining
-        
-        laps_to_critical = (competitor.fuel_level - critical_threshold) / fuel_per_lap
-        critical_lap = self.current_lap + int(laps_to_critical)
+        if competitor.fuel_level <= 0.1:  # Already critical
+            critical_lap = self.current_lap
+        elif fuel_per_lap <= 0.0:  # Not burning fuel, never critical
+            critical_lap = None
+        else:
+            critical_threshold = 0.05  # 5% fuel remaining
+            
+            laps_to_critical = (competitor.fuel_level - critical_threshold) / fuel_per_lap
+            critical_lap = self.current_lap + int(laps_to_critical) if laps_to_critical > 0 else None
         
-        return critical_lap if laps_to_critical > 0 else None
+        if cache is not None:
+            cache[competitor.car_id] = critical_lap
+        return critical_lap
     
     def _predict_position_changes(self, competitor: CompetitorModel, future_laps: int) -> Dict[str, Any]:
         """Predict likely position changes."""
+        volatility = competitor.position_history_count * 0.1
+        low = competitor.current_position - 2
+        high = competitor.current_position + 2
         return {
-            "position_volatility": min(1.0, len(competitor.position_history) * 0.1),
+            "position_volatility": volatility if volatility < 1.0 else 1.0,
             "likely_position_range": [
-                max(1, competitor.current_position - 2),
-                min(20, competitor.current_position + 2)
+                low if low > 1 else 1,
+                high if high < 20 else 20
             ],
             "position_trend": "stable"  # Simplified - would analyze historical data
         }
@@ -1482,7 +2750,6 @@ class FieldTwin(BaseTwinModel):
     def _predict_threat_evolution(self, competitor: CompetitorModel, future_laps: int) -> List[str]:
         """Predict how threat level will evolve."""
         evolution = []
-        current_threat = competitor.strategic_threat_level
         
         # Simplified prediction based on pit probability and position
         if competitor.pit_probability > 0.7:
@@ -1495,85 +2762,106 @@ class FieldTwin(BaseTwinModel):
         
         return evolution
     
-    def _find_peak_performance_lap(self, evolution: List[Dict[str, Any]]) -> int:
-        """Find lap with best predicted performance."""
-        if not evolution:
-            return 0
-        
-        best_lap = min(evolution, key=lambda x: x["predicted_lap_time"])
-        return best_lap["lap_offset"]
-    
     def _calculate_strategy_confidence(self, competitor: CompetitorModel) -> float:
         """Calculate confidence in strategy predictions."""
-        data_quality = min(1.0, len(competitor.lap_times_history) / 10.0)
-        behavioral_consistency = competitor.behavioral_profile["tire_management"]
-        pit_history_factor = min(1.0, len(competitor.pit_stops) * 0.3)
+        cache = self._pred_cache["strategy_confidence"] if self._pred_cache is not None else None
+        if cache is not None and competitor.car_id in cache:
+            return cache[competitor.car_id]
+        
+        data_quality = competitor.lap_history_count / 10.0
+        if data_quality > 1.0:
+            data_quality = 1.0
+        behavioral_consistency = competitor.behavioral_profile.tire_management
+        pit_history_factor = competitor.pit_stop_count * 0.3
+        if pit_history_factor > 1.0:
+            pit_history_factor = 1.0
         
         return (data_quality + behavioral_consistency + pit_history_factor) / 3.0
     
     def _calculate_behavior_confidence(self, competitor: CompetitorModel) -> float:
         """Calculate confidence in behavioral predictions."""
-        return min(1.0, len(competitor.position_history) / 20.0)
+        cache = self._pred_cache["behavior_confidence"] if self._pred_cache is not None else None
+        if cache is not None and competitor.car_id in cache:
+            return cache[competitor.car_id]
+        
+        confidence = competitor.position_history_count / 20.0
+        return confidence if confidence < 1.0 else 1.0
     
     def _analyze_response_patterns(self, competitor: CompetitorModel) -> List[Dict[str, Any]]:
         """Analyze how competitor responds to strategic moves."""
         patterns = []
+        profile = competitor.behavioral_profile
         
         # Defensive response pattern
-        if competitor.behavioral_profile["aggressive_defense"] > 0.6:
-            patterns.append({
-                "trigger": "undercut_attempt",
-                "response": "early_pit_counter",
-                "probability": competitor.behavioral_profile["aggressive_defense"],
-                "effectiveness": 0.7
-            })
+        if profile.aggressive_defense > 0.6:
+            pattern = _UNDERCUT_RESPONSE_PATTERN.copy()
+            pattern["probability"] = profile.aggressive_defense
+            patterns.append(pattern)
         
         # Conservative response pattern
-        if competitor.behavioral_profile["tire_management"] > 0.7:
-            patterns.append({
-                "trigger": "overcut_attempt",
-                "response": "extend_stint",
-                "probability": competitor.behavioral_profile["tire_management"],
-                "effectiveness": 0.6
-            })
+        if profile.tire_management > 0.7:
+            pattern = _OVERCUT_RESPONSE_PATTERN.copy()
+            pattern["probability"] = profile.tire_management
+            patterns.append(pattern)
         
         return patterns
     
     def _calculate_strategic_value(self, competitor: CompetitorModel, strategy_type: str) -> float:
-        """Calculate strategic value of an opportunity."""
-        base_value = 0.5
-        
-        # Position factor
-        position_factor = max(0.0, (10 - competitor.current_position) / 10.0)
+        """
+        Calculate strategic value of an opportunity.
         
-        # Threat factor
-        threat_multipliers = {"low": 0.2, "medium": 0.5, "high": 0.8, "critical": 1.0}
-        threat_factor = threat_multipliers.get(competitor.strategic_threat_level, 0.5)
+        Only called for competitors at ``Threat.MEDIUM`` or above; low-threat
+        competitors are filtered out before their pit timing is predicted.
         
+        Args:
+            competitor: Target competitor
+            strategy_type: "undercut" or "overcut"
+            
+        Returns:
+            Strategic value (0.0 to 1.0)
+        """
         # Strategy-specific factors
         if strategy_type == "undercut":
-            strategy_factor = competitor.behavioral_profile["undercut_tendency"]
+            strategy_factor = competitor.behavioral_profile.undercut_tendency
         else:  # overcut
-            strategy_factor = 1.0 - competitor.behavioral_profile["aggressive_defense"]
+            strategy_factor = 1.0 - competitor.behavioral_profile.aggressive_defense
         
-        return min(1.0, base_value + position_factor * 0.3 + threat_factor * 0.2 + strategy_factor * 0.2)
+        return float(_strategic_value_core(
+            competitor.current_position, competitor.threat_code, strategy_factor
+        ))
+    
+    def _get_threat_multiplier(self, threat_code: int) -> float:
+        """Get multiplier for a ``Threat`` code."""
+        return _THREAT_RISK_MULTIPLIERS[threat_code]
     
-    def _get_threat_multiplier(self, threat_level: str) -> float:
-        """Get multiplier for threat level."""
-        multipliers = {"low": 0.5, "medium": 0.7, "high": 0.9, "critical": 1.0}
-        return multipliers.get(threat_level, 0.5)
+    def _competitors_at(self, position: int) -> List[CompetitorModel]:
+        """
+        Get competitors currently at a position.
+        
+        Args:
+            position: Race position
+            
+        Returns:
+            Competitors at that position, in tracking order
+        """
+        if self._position_index is None:
+            position_index = defaultdict(list)
+            for competitor in self._competitor_list:
+                position_index[competitor.current_position].append(competitor)
+            self._position_index = position_index
+        return self._position_index.get(position, [])
     
     def _analyze_position_loss_risks(self, future_laps: int) -> List[Dict[str, Any]]:
         """Analyze risks of losing positions."""
         risks = []
         
-        for competitor in self.competitors.values():
-            if (competitor.current_position == self.our_position + 1 and  # Directly behind us
-                competitor.strategic_threat_level in ["medium", "high", "critical"]):
-                
-                risk_score = (competitor.behavioral_profile["undercut_tendency"] * 0.4 +
+        # Only the car directly behind us can take our position
+        for competitor in self._competitors_at(self.our_position + 1):
+            if competitor.threat_code >= Threat.MEDIUM:
+                profile = competitor.behavioral_profile
+                risk_score = (profile.undercut_tendency * 0.4 +
                              competitor.pit_probability * 0.3 +
-                             (1.0 - competitor.behavioral_profile["tire_management"]) * 0.3)
+                             (1.0 - profile.tire_management) * 0.3)
                 
                 risks.append({
                     "car_id": competitor.car_id,
@@ -1586,48 +2874,41 @@ class FieldTwin(BaseTwinModel):
     
     def _calculate_isolation_risk(self) -> float:
         """Calculate risk of strategic isolation."""
-        # Count competitors with similar strategies
-        our_strategy = "two_stop"  # Would be determined from our car twin
-        similar_strategies = sum(1 for c in self.competitors.values() 
-                               if c.predicted_strategy == our_strategy)
-        
-        total_competitors = len(self.competitors)
-        if total_competitors == 0:
-            return 0.0
+        if self._strategy_counts is None:
+            self._strategy_counts = Counter(c.strategy_code for c in self._competitor_list)
         
-        # High isolation risk if we're alone in our strategy
-        isolation_factor = 1.0 - (similar_strategies / total_competitors)
-        
-        # Adjust for track position
-        position_factor = min(1.0, self.our_position / 10.0)  # Higher positions = higher risk
+        # Count competitors with similar strategies
+        our_strategy = Strategy.TWO_STOP  # Would be determined from our car twin
+        similar_strategies = self._strategy_counts.get(our_strategy, 0)
         
-        return min(1.0, isolation_factor * 0.7 + position_factor * 0.3)
+        return float(_isolation_risk_core(similar_strategies, len(self.competitors), self.our_position))
     
     def _identify_close_battles(self) -> List[Dict[str, Any]]:
         """Identify close position battles."""
         battles = []
-        
-        # Group competitors by position proximity
-        position_groups = {}
-        for competitor in self.competitors.values():
-            pos = competitor.current_position
-            if pos not in position_groups:
-                position_groups[pos] = []
-            position_groups[pos].append(competitor)
-        
-        # Find adjacent positions with close gaps
-        for pos in sorted(position_groups.keys()):
-            if pos + 1 in position_groups:
-                car1 = position_groups[pos][0] if position_groups[pos] else None
-                car2 = position_groups[pos + 1][0] if position_groups[pos + 1] else None
-                
-                if car1 and car2:
-                    gap = abs(car1.gap_to_leader - car2.gap_to_leader)
-                    if gap < 2.0:  # Within 2 seconds
-                        battles.append({
-                            "cars": [car1.car_id, car2.car_id],
-                            "gap": gap,
-                            "positions": [pos, pos + 1]
-                        })
+        table = self._competitor_table
+        if len(table.car_ids) < 2:
+            return battles
+        
+        # Position and gap columns are kept current by _update_competitor
+        car_ids = table.car_ids
+        positions = table.pos.astype(np.int64)
+        gaps = table.gap
+        
+        # Order by position, keeping the first competitor seen at each position
+        order = np.argsort(positions, kind="stable")
+        unique_positions, first = np.unique(positions[order], return_index=True)
+        leaders = order[first]
+        
+        # Find adjacent positions with close gaps (within 2 seconds)
+        gap_diffs = np.abs(gaps[leaders[:-1]] - gaps[leaders[1:]])
+        close = np.flatnonzero((np.diff(unique_positions) == 1) & (gap_diffs < 2.0))
+        for i, pos, gap in zip(close.tolist(), unique_positions[close].tolist(),
+                               gap_diffs[close].tolist()):
+            battles.append({
+                "cars": [car_ids[leaders[i]], car_ids[leaders[i + 1]]],
+                "gap": gap,
+                "positions": [pos, pos + 1]
+            })
         
         return battles
\ No newline at end of file
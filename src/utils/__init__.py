@@ -3,10 +3,19 @@ Utility modules for the F1 Dual Twin System.
 """
 
 from .config import SystemConfig, get_config, set_config, load_config_file
+from .jit import njit, prange, NUMBA_AVAILABLE
+from .json_codec import json_dumps, json_dumpb, json_loads, ORJSON_AVAILABLE
 
 __all__ = [
     "SystemConfig",
     "get_config", 
     "set_config",
-    "load_config_file"
+    "load_config_file",
+    "njit",
+    "prange",
+    "NUMBA_AVAILABLE",
+    "json_dumps",
+    "json_dumpb",
+    "json_loads",
+    "ORJSON_AVAILABLE"
 ]
\ No newline at end of file
@@ -156,6 +156,7 @@ class SystemConfig(ConfigurationManager):
                 "update_interval_seconds": 3,
                 "processing_timeout_ms": 250,
                 "validation_enabled": True,
+                "deep_validation_enabled": False,
                 "fallback_to_last_valid": True,
                 "output_file": "shared/telemetry_state.json"
             },
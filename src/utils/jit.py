@@ -0,0 +1,37 @@
+"""
+Optional JIT compilation support for numeric hot paths.
+
+Numba is an optional dependency. When it is installed, ``njit`` compiles the
+decorated function to native code; otherwise the decorators return the plain
+Python function so callers behave identically, only slower.
+"""
+
+from typing import Any, Callable
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    
+    def njit(*args: Any, **kwargs: Any) -> Callable:
+        """
+        Fallback for ``numba.njit`` that leaves the function uncompiled.
+        
+        Supports both the bare ``@njit`` and the ``@njit(...)`` forms.
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        
+        def decorator(func: Callable) -> Callable:
+            return func
+        
+        return decorator
+
+
+__all__ = [
+    "njit",
+    "prange",
+    "NUMBA_AVAILABLE"
+]
@@ -0,0 +1,115 @@
+"""
+Optional fast JSON encoding for twin state snapshots.
+
+orjson is an optional dependency. When it is installed, ``json_dumps`` uses it
+to serialize state dictionaries, datetimes and NumPy values directly in C and
+``json_loads`` uses it to parse them back, with ``json_dumpb`` producing the
+encoded bytes for file writes directly; otherwise both fall back to the
+standard library with equivalent handling of those types.
+"""
+
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Union
+
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _default(obj: Any) -> Any:
+    """
+    Convert values the JSON encoders do not handle natively.
+
+    Args:
+        obj: Value to convert
+
+    Returns:
+        JSON-serializable representation of the value
+    """
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(data: Any, indent: bool = False) -> str:
+    """
+    Serialize data to a JSON string.
+
+    Args:
+        data: Data to serialize
+        indent: Whether to pretty-print with two-space indentation
+
+    Returns:
+        JSON string
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_default, option=option).decode("utf-8")
+
+    return json.dumps(data, indent=2 if indent else None, default=_default)
+
+
+def json_dumpb(data: Any, newline: bool = False) -> bytes:
+    """
+    Serialize data to UTF-8 encoded JSON bytes.
+    
+    With orjson the bytes are produced directly, without an intermediate
+    string, which suits writing straight to files.
+    
+    Args:
+        data: Data to serialize
+        newline: Whether to append a newline, for JSON-lines records
+        
+    Returns:
+        Compact JSON document as bytes
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(data, default=_default, option=option)
+    
+    text = json.dumps(data, default=_default)
+    return (text + "\n" if newline else text).encode("utf-8")
+
+
+def json_loads(data: Union[str, bytes, memoryview]) -> Any:
+    """
+    Parse a JSON document.
+    
+    orjson parses a memoryview, such as one over a memory-mapped file, in
+    place; the standard library fallback copies it to bytes first.
+    
+    Args:
+        data: JSON text, UTF-8 encoded bytes or a memoryview of them
+        
+    Returns:
+        Parsed data
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+__all__ = [
+    "json_dumps",
+    "json_dumpb",
+    "json_loads",
+    "ORJSON_AVAILABLE"
+]
@@ -0,0 +1,170 @@
+"""
+Unit tests for the AI strategist response cache and streamed response parsing.
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+pytest.importorskip("aiohttp")
+
+from max_integration.ai_strategist import AIStrategist
+
+
+RESPONSE_TEXT = (
+    "Here are the recommendations:\n"
+    "1. URGENT: Pit - Box this lap\n"
+    "   Description: Tires are finished\n"
+    "   Execution: lap 24\n"
+    "2. MODERATE: Tire - Manage the rears\n"
+    "   Risks: Losing time to the car behind\n"
+    "3. OPTIONAL: Fuel - Lift and coast\n"
+    "   Reasoning: Long final stint"
+)
+
+STRATEGY_DATA = {
+    "car_twin": None,
+    "field_twin": None,
+    "simulation_results": [],
+    "race_context": {"lap": 22, "session_type": "race"}
+}
+
+
+class FakeStreamContent:
+    """Server-sent event lines of a streamed chat completion."""
+    
+    def __init__(self, text: str, chunk_size: int):
+        pieces = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        self.lines = [b": keep-alive\n"]
+        for piece in pieces:
+            chunk = {"choices": [{"delta": {"content": piece}}]}
+            self.lines.append(f"data: {json.dumps(chunk)}\n".encode("utf-8"))
+        self.lines.append(b"data: [DONE]\n")
+    
+    async def _iterate(self):
+        for line in self.lines:
+            yield line
+    
+    def __aiter__(self):
+        return self._iterate()
+
+
+class FakeResponse:
+    """Streamed chat completion response."""
+    
+    def __init__(self, text: str, chunk_size: int):
+        self.status = 200
+        self.content = FakeStreamContent(text, chunk_size)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class FakeSession:
+    """Client session answering every request with the same streamed text."""
+    
+    def __init__(self, text: str, chunk_size: int = 5):
+        self.text = text
+        self.chunk_size = chunk_size
+        self.requests = []
+    
+    def post(self, url, json=None, headers=None):
+        self.requests.append(json)
+        return FakeResponse(self.text, self.chunk_size)
+
+
+def stream_titles(text: str, chunk_size: int):
+    """Stream text through a strategist and return the recommendation titles."""
+    strategist = AIStrategist()
+    strategist.session = FakeSession(text, chunk_size)
+    
+    async def collect():
+        return [rec async for rec in strategist.stream_recommendations(STRATEGY_DATA)]
+    
+    return [rec["title"] for rec in asyncio.run(collect())]
+
+
+def test_streamed_parse_matches_single_chunk():
+    """Recommendations do not depend on how the response is chunked."""
+    for text in (RESPONSE_TEXT, RESPONSE_TEXT + "\n"):
+        batch = stream_titles(text, len(text))
+        assert batch == [
+            "1. URGENT: Pit - Box this lap",
+            "2. MODERATE: Tire - Manage the rears",
+            "3. OPTIONAL: Fuel - Lift and coast"
+        ]
+        for chunk_size in (1, 2, 7, 16):
+            assert stream_titles(text, chunk_size) == batch
+
+
+def test_stream_ending_on_numbered_header_keeps_previous_recommendation():
+    """A final header without a newline finishes the recommendation before it."""
+    text = RESPONSE_TEXT.rsplit("\n", 1)[0]
+    assert text.endswith("3. OPTIONAL: Fuel - Lift and coast")
+    
+    batch = stream_titles(text, len(text))
+    assert len(batch) == 3
+    for chunk_size in (1, 4, 9):
+        assert stream_titles(text, chunk_size) == batch
+
+
+def test_streamed_fields_are_parsed():
+    """Block fields are attached to the recommendation they follow."""
+    strategist = AIStrategist()
+    strategist.session = FakeSession(RESPONSE_TEXT, 3)
+    
+    recommendations = asyncio.run(strategist.generate_recommendations(STRATEGY_DATA))
+    
+    assert recommendations[0]["priority"] == "urgent"
+    assert recommendations[0]["category"] == "pit_strategy"
+    assert recommendations[0]["description"] == "Tires are finished"
+    assert recommendations[0]["execution_lap"] == 24
+    assert recommendations[1]["risks"] == ["Losing time to the car behind"]
+    assert recommendations[2]["reasoning"] == "Long final stint"
+    assert strategist.session.requests[0]["stream"] is True
+
+
+def test_repeated_prompt_is_served_from_cache():
+    """An identical race state reuses the cached recommendations."""
+    strategist = AIStrategist()
+    strategist.session = FakeSession(RESPONSE_TEXT)
+    
+    first = asyncio.run(strategist.generate_recommendations(STRATEGY_DATA))
+    second = asyncio.run(strategist.generate_recommendations(STRATEGY_DATA))
+    
+    assert second == first
+    assert len(strategist.session.requests) == 1
+
+
+def test_cache_entries_expire():
+    """Entries older than the TTL are dropped on lookup."""
+    strategist = AIStrategist(cache_ttl_seconds=0.05)
+    strategist._cache_response("a", [{"title": "A"}])
+    assert strategist._get_cached_response("a") == [{"title": "A"}]
+    
+    time.sleep(0.1)
+    assert strategist._get_cached_response("a") is None
+    assert "a" not in strategist._response_cache
+
+
+def test_cache_evicts_least_recently_used():
+    """The least recently used entry is evicted once the cache is full."""
+    strategist = AIStrategist(cache_size=2)
+    strategist._cache_response("a", [{"title": "A"}])
+    strategist._cache_response("b", [{"title": "B"}])
+    strategist._get_cached_response("a")
+    strategist._cache_response("c", [{"title": "C"}])
+    
+    assert strategist._get_cached_response("b") is None
+    assert strategist._get_cached_response("a") == [{"title": "A"}]
+    assert strategist._get_cached_response("c") == [{"title": "C"}]
@@ -0,0 +1,193 @@
+"""
+Unit tests for HPC orchestrator state persistence: full snapshots, the
+changed-competitor journal and replaying both on load.
+"""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from max_integration.hpc_orchestrator import HPCOrchestrator
+from utils.json_codec import json_dumpb, json_loads
+
+
+def create_telemetry(lap, changed_cars=None):
+    """
+    Create telemetry for a five-car field.
+    
+    Only cars in changed_cars (all cars by default) are reported, so later
+    frames change a subset of competitors.
+    """
+    cars = []
+    for i in range(1, 6):
+        if changed_cars is not None and str(i) not in changed_cars:
+            continue
+        cars.append({
+            "car_id": str(i),
+            "team": f"Team {i}",
+            "driver": f"Driver {i}",
+            "position": i,
+            "speed": 280.0 + i,
+            "fuel_level": 0.8,
+            "lap_time": 81.0 + i * 0.1,
+            "tire": {"compound": "medium", "age": 5 + lap, "wear_level": 0.2}
+        })
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "lap": lap,
+        "session_type": "race",
+        "track_conditions": {"temperature": 30.0, "weather": "sunny", "track_status": "green"},
+        "cars": cars
+    }
+
+
+def apply_update(orchestrator, lap, changed_cars=None):
+    """Apply one frame and write its snapshot synchronously."""
+    return apply_telemetry(orchestrator, create_telemetry(lap, changed_cars))
+
+
+def apply_telemetry(orchestrator, telemetry):
+    """Apply a telemetry frame and write its snapshot synchronously."""
+    orchestrator.field_twin.update_state(telemetry)
+    orchestrator.update_count += 1
+    snapshot = orchestrator._build_state_snapshot()
+    orchestrator._write_state_file(snapshot)
+    return json_loads(json_dumpb(snapshot))
+
+
+def journal_records(orchestrator):
+    """Journal records currently on disk."""
+    return [json_loads(line) for line in orchestrator.journal_file.read_bytes().splitlines()]
+
+
+@pytest.fixture
+def orchestrator(tmp_path, monkeypatch):
+    """Orchestrator persisting into a temporary working directory."""
+    monkeypatch.chdir(tmp_path)
+    orchestrator = HPCOrchestrator()
+    yield orchestrator
+    orchestrator.shutdown()
+
+
+def test_journal_replay_restores_latest_state(orchestrator):
+    """Snapshot plus journal replay yields the last written snapshot."""
+    apply_update(orchestrator, 1)
+    apply_update(orchestrator, 2)
+    apply_update(orchestrator, 3, changed_cars={"2"})
+    latest = apply_update(orchestrator, 4, changed_cars={"4", "5"})
+    
+    records = journal_records(orchestrator)
+    assert [record["update_count"] for record in records] == [2, 3, 4]
+    assert [c["car_id"] for c in records[1]["field_twin_state"]["competitors"]] == ["2"]
+    assert [c["car_id"] for c in records[2]["field_twin_state"]["competitors"]] == ["4", "5"]
+    
+    assert orchestrator._read_persisted_state() == latest
+
+
+def test_full_field_record_holds_only_changed_competitors(orchestrator):
+    """Competitors reported with unchanged values are left out of the journal."""
+    apply_update(orchestrator, 1)
+    apply_update(orchestrator, 2)
+    
+    telemetry = create_telemetry(2)
+    telemetry["cars"][2]["speed"] += 5.0
+    latest = apply_telemetry(orchestrator, telemetry)
+    
+    record = orchestrator.journal_file.read_bytes().splitlines()[-1]
+    competitors = json_loads(record)["field_twin_state"]["competitors"]
+    assert [c["car_id"] for c in competitors] == ["3"]
+    assert len(record) < len(orchestrator.state_file.read_bytes()) / 2
+    
+    assert orchestrator._read_persisted_state() == latest
+
+
+def test_unchanged_state_is_not_written(orchestrator):
+    """A frame that changes no competitor or race state writes nothing."""
+    apply_update(orchestrator, 1)
+    latest = apply_update(orchestrator, 2)
+    journal = orchestrator.journal_file.read_bytes()
+    
+    apply_update(orchestrator, 2)
+    
+    assert orchestrator.journal_file.read_bytes() == journal
+    assert orchestrator._read_persisted_state() == latest
+
+
+def test_journal_file_is_not_executable(orchestrator):
+    """The journal is created without execute permissions."""
+    apply_update(orchestrator, 1)
+    
+    assert orchestrator.journal_file.stat().st_mode & 0o111 == 0
+
+
+def test_torn_final_journal_record_is_ignored(orchestrator):
+    """A partially written final record does not prevent loading."""
+    apply_update(orchestrator, 1)
+    latest = apply_update(orchestrator, 2)
+    
+    with open(orchestrator.journal_file, "ab") as journal:
+        journal.write(b'{"update_count": 3, "field_twin_state": {"compet')
+    
+    assert orchestrator._read_persisted_state() == latest
+
+
+def test_journal_records_older_than_snapshot_are_skipped(orchestrator):
+    """Records left over from before a newer snapshot are not replayed."""
+    apply_update(orchestrator, 1)
+    apply_update(orchestrator, 2)
+    apply_update(orchestrator, 3)
+    
+    # A crash after the new snapshot replaced the state file but before the
+    # journal was truncated leaves the old records behind
+    orchestrator.field_twin.update_state(create_telemetry(4))
+    orchestrator.update_count += 1
+    snapshot = json_loads(json_dumpb(orchestrator._build_state_snapshot()))
+    orchestrator.state_file.write_bytes(json_dumpb(snapshot))
+    
+    assert len(journal_records(orchestrator)) == 2
+    assert orchestrator._read_persisted_state() == snapshot
+
+
+def test_snapshot_interval_starts_a_new_journal(orchestrator):
+    """A full snapshot is written once the journal reaches the interval."""
+    orchestrator.state_snapshot_interval = 2
+    for lap in range(1, 4):
+        apply_update(orchestrator, lap)
+    assert len(journal_records(orchestrator)) == 2
+    
+    latest = apply_update(orchestrator, 4)
+    assert journal_records(orchestrator) == []
+    assert json_loads(orchestrator.state_file.read_bytes()) == latest
+
+
+def test_writes_after_shutdown_reopen_with_full_snapshot(orchestrator):
+    """The journal is reopened from a full snapshot after shutdown."""
+    apply_update(orchestrator, 1)
+    apply_update(orchestrator, 2)
+    orchestrator.shutdown()
+    
+    latest = apply_update(orchestrator, 3)
+    assert journal_records(orchestrator) == []
+    assert json_loads(orchestrator.state_file.read_bytes()) == latest
+    
+    latest = apply_update(orchestrator, 4)
+    assert len(journal_records(orchestrator)) == 1
+    assert orchestrator._read_persisted_state() == latest
+
+
+def test_restart_loads_persisted_update_count(orchestrator):
+    """A new orchestrator restores the persisted update count on start."""
+    apply_update(orchestrator, 1)
+    apply_update(orchestrator, 2)
+    orchestrator.shutdown()
+    
+    restarted = HPCOrchestrator()
+    try:
+        assert restarted.update_count == 2
+    finally:
+        restarted.shutdown()
@@ -0,0 +1,44 @@
+"""
+Unit tests for HPC orchestrator simulation submission and shutdown.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from max_integration.hpc_orchestrator import HPCOrchestrator
+
+
+@pytest.fixture
+def orchestrator(tmp_path, monkeypatch):
+    """Orchestrator with HPC simulations enabled."""
+    monkeypatch.chdir(tmp_path)
+    orchestrator = HPCOrchestrator()
+    orchestrator.hpc_enabled = True
+    yield orchestrator
+    orchestrator.shutdown()
+
+
+def test_shutdown_resolves_every_submitted_simulation(orchestrator):
+    """Pending simulations finish or are cancelled, and leave the pending set."""
+    futures = [orchestrator.submit_strategic_simulation("undercut", {}) for _ in range(20)]
+    
+    orchestrator.shutdown()
+    
+    assert all(future.done() for future in futures)
+    assert not orchestrator._sim_futures
+    finished = sum(1 for future in futures if not future.cancelled())
+    assert orchestrator.get_performance_metrics()["simulation_requests"] == finished
+
+
+def test_simulations_can_be_submitted_after_shutdown(orchestrator):
+    """A request after shutdown starts a new simulation loop."""
+    orchestrator.submit_strategic_simulation("undercut", {}).result(timeout=5)
+    orchestrator.shutdown()
+    
+    result = orchestrator.submit_strategic_simulation("undercut", {}).result(timeout=5)
+    assert result["status"] == "success"